@@ -0,0 +1,377 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Benchmarks
+
+Rough timing scripts for the data loading code. They are not part of the
+game or the tests.
+
+Usage:
+    python benchmarks.py parse [blocks]
+    python benchmarks.py memory [blocks ...]
+    python benchmarks.py render [quests]
+    python benchmarks.py save [saves]
+    python benchmarks.py load [characters]
+    python benchmarks.py list [characters]
+    python benchmarks.py bulk [characters]
+    python benchmarks.py cache [blocks]
+    python benchmarks.py watch [blocks]
+    python benchmarks.py parallel [blocks]
+"""
+
+import os
+import pickle
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import character_manager
+import game_data
+import quest_handler
+from custom_exceptions import InvalidDataFormatError
+
+# ============================================================================
+# SYNTHETIC DATA
+# ============================================================================
+
+def write_synthetic_quests(filename, block_count):
+    """Write block_count made-up quests to filename."""
+    with open(filename, "w") as f:
+        for i in range(block_count):
+            prereq = "quest_" + str(i - 1) if i % 10 else "NONE"
+            f.write(
+                "QUEST_ID: quest_" + str(i) + "\n"
+                "TITLE: Quest number " + str(i) + "\n"
+                "DESCRIPTION: Defeat " + str(i % 7 + 1) + " goblins near the village\n"
+                "REWARD_XP: " + str(50 + i % 200) + "\n"
+                "REWARD_GOLD: " + str(10 + i % 90) + "\n"
+                "REQUIRED_LEVEL: " + str(1 + i % 30) + "\n"
+                "PREREQUISITE: " + prereq + "\n\n"
+            )
+
+# ============================================================================
+# BASELINE PARSER
+# ============================================================================
+
+def legacy_load_quests(filename):
+    """
+    The original if/elif quest loader, kept here as the "before" number.
+    """
+    with open(filename, "r") as f:
+        lines = f.readlines()
+
+    quests = {}
+    block = []
+    for line in lines + [""]:
+        stripped = line.strip()
+        if stripped == "":
+            if block:
+                quest = legacy_parse_quest_block(block)
+                game_data.validate_quest_data(quest)
+                quests[quest["quest_id"]] = quest
+                block = []
+        else:
+            block.append(stripped)
+    return quests
+
+def legacy_parse_quest_block(lines):
+    quest = {}
+    for line in lines:
+        if ":" not in line:
+            raise InvalidDataFormatError("Invalid quest line: " + line)
+        key, value = line.split(":", 1)
+        key = key.strip()
+        value = value.strip()
+        if key == "QUEST_ID":
+            quest["quest_id"] = value
+        elif key == "TITLE":
+            quest["title"] = value
+        elif key == "DESCRIPTION":
+            quest["description"] = value
+        elif key == "REWARD_XP":
+            try:
+                quest["reward_xp"] = int(value)
+            except ValueError:
+                raise InvalidDataFormatError("REWARD_XP must be a number")
+        elif key == "REWARD_GOLD":
+            try:
+                quest["reward_gold"] = int(value)
+            except ValueError:
+                raise InvalidDataFormatError("REWARD_GOLD must be a number")
+        elif key == "REQUIRED_LEVEL":
+            try:
+                quest["required_level"] = int(value)
+            except ValueError:
+                raise InvalidDataFormatError("REQUIRED_LEVEL must be a number")
+        elif key == "PREREQUISITE":
+            quest["prerequisite"] = value
+        else:
+            raise InvalidDataFormatError("Unknown quest field: " + key)
+    return quest
+
+# ============================================================================
+# BENCHMARKS
+# ============================================================================
+
+def time_call(function, *args):
+    """Return (seconds, result) for one call."""
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+def buffer_load_quests(filename):
+    """Load quests by scanning the whole file contents at once."""
+    with open(filename, "r") as f:
+        text = f.read()
+    return {q["quest_id"]: q for q in game_data.parse_catalog_text(text, "quests")}
+
+def bench_parse(block_count=1000000):
+    """Compare quest parsing speed before and after the schema parser."""
+    with tempfile.TemporaryDirectory() as folder:
+        filename = os.path.join(folder, "quests.txt")
+        write_synthetic_quests(filename, block_count)
+
+        print(f"Parsing {block_count} quest blocks")
+        for name, loader in [("legacy if/elif", legacy_load_quests),
+                             ("schema streaming", game_data.load_quests),
+                             ("schema buffer", buffer_load_quests)]:
+            seconds, quests = time_call(loader, filename)
+            assert len(quests) == block_count
+            print(f"  {name:<18} {seconds:8.2f}s  {block_count / seconds:12,.0f} records/s")
+
+def measure_memory(loader, filename):
+    """Return the bytes still allocated by loader(filename)'s result."""
+    tracemalloc.start()
+    result = loader(filename)
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return current
+
+def bench_memory(block_counts=(100000, 1000000)):
+    """Compare memory of plain dict quests with slotted Quest records."""
+    with tempfile.TemporaryDirectory() as folder:
+        for block_count in block_counts:
+            filename = os.path.join(folder, "quests.txt")
+            write_synthetic_quests(filename, block_count)
+
+            dict_bytes = measure_memory(legacy_load_quests, filename)
+            slot_bytes = measure_memory(game_data.load_quests, filename)
+            print(f"{block_count} quests")
+            print(f"  dict records     {dict_bytes / 1e6:10.1f} MB  {dict_bytes / block_count:6.0f} B/quest")
+            print(f"  slotted records  {slot_bytes / 1e6:10.1f} MB  {slot_bytes / block_count:6.0f} B/quest")
+
+def print_quest_list(quest_list):
+    """The original quest list display, one print per quest."""
+    for quest in quest_list:
+        print(f"{quest.get('title', 'Unknown')} - Level {quest.get('required_level', 1)}, "
+              f"XP: {quest.get('reward_xp', 0)}, Gold: {quest.get('reward_gold', 0)}")
+
+def bench_render(quest_count=100000):
+    """Compare printing a quest board line by line with one buffered write."""
+    with tempfile.TemporaryDirectory() as folder:
+        filename = os.path.join(folder, "quests.txt")
+        write_synthetic_quests(filename, quest_count)
+        quest_list = list(game_data.load_quests(filename).values())
+
+    # Best of a few rounds, each starting from an empty row cache
+    best = {}
+    real_stdout = sys.stdout
+    with open(os.devnull, "w", buffering=1) as devnull:  # Line buffered, like a terminal
+        sys.stdout = devnull
+        try:
+            for _ in range(3):
+                quest_handler._row_cache.clear()
+                quest_handler._row_layouts.clear()
+                for name, function in [("print per line", print_quest_list),
+                                       ("buffered, cold", quest_handler.display_quest_list),
+                                       ("buffered, refresh", quest_handler.display_quest_list),
+                                       ("buffered, cached", quest_handler.display_quest_list)]:
+                    if function is print_quest_list:
+                        seconds = time_call(function, quest_list)[0]
+                    else:
+                        seconds = time_call(function, quest_list, None, 20, 100)[0]
+                    best[name] = min(seconds, best.get(name, seconds))
+        finally:
+            sys.stdout = real_stdout
+    results = list(best.items())
+
+    print(f"Rendering {quest_count} quests")
+    for name, seconds in results:
+        print(f"  {name:<18} {seconds:8.3f}s")
+
+def legacy_save_character(character, save_directory):
+    """The original save: one write call per line straight into the save file."""
+    f = open(os.path.join(save_directory, character["name"] + "_save.txt"), "w")
+    for line in character_manager.format_save_data(character).splitlines():
+        f.write(line + "\n")
+    f.close()
+    return True
+
+def bench_save(save_count=2000):
+    """Compare saves per second for the old save and each durability level."""
+    character = character_manager.create_character("BenchHero", "Warrior")
+    character["inventory"] = ["health_potion"] * 20
+    character["completed_quests"].extend("quest_" + str(i) for i in range(200))
+
+    print(f"Saving a character {save_count} times")
+    with tempfile.TemporaryDirectory() as folder:
+        runs = [("legacy (not atomic)", lambda: legacy_save_character(character, folder))]
+        for level in character_manager.DURABILITY_LEVELS:
+            runs.append(("atomic, " + level,
+                         lambda level=level: character_manager.save_character(character, folder, level)))
+        for name, save in runs:
+            start = time.perf_counter()
+            for _ in range(save_count):
+                assert save()
+            seconds = time.perf_counter() - start
+            print(f"  {name:<20} {save_count / seconds:10,.0f} saves/s")
+
+def bench_load(character_count=20000):
+    """Compare loading characters from text saves and binary saves."""
+    print(f"Loading {character_count} characters")
+    with tempfile.TemporaryDirectory() as folder:
+        for save_format in character_manager.SAVE_FORMATS:
+            save_directory = os.path.join(folder, save_format)
+            names = []
+            for i in range(character_count):
+                character = character_manager.create_character("Hero" + str(i), "Warrior")
+                character["inventory"] = ["health_potion", "iron_sword", "leather_armor"]
+                character["completed_quests"].extend("quest_" + str(q) for q in range(i % 40))
+                character_manager.save_character(character, save_directory, format=save_format)
+                names.append(character["name"])
+
+            start = time.perf_counter()
+            for name in names:
+                character_manager.load_character(name, save_directory)
+            seconds = time.perf_counter() - start
+            print(f"  {save_format:<8} {character_count / seconds:10,.0f} loads/s")
+
+def bench_list(character_count=100000):
+    """Time listing saves from a cold folder scan and from the manifest."""
+    print(f"Listing {character_count} saved characters")
+    with tempfile.TemporaryDirectory() as folder:
+        character = character_manager.create_character("Hero", "Mage")
+        text = character_manager.format_save_data(character)
+        for i in range(character_count):
+            filename = character_manager.get_save_filename("Hero" + str(i), folder)
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+            with open(filename, "w") as f:
+                f.write(text)
+
+        for name in ["first (scan)", "manifest"]:
+            seconds, saves = time_call(character_manager.list_saved_characters, folder)
+            assert len(saves) == character_count
+            print(f"  {name:<14} {seconds:8.3f}s")
+
+def bench_bulk(character_count=5000, worker_counts=(1, 2, 4, 8, 16)):
+    """Compare bulk save and load throughput for different thread counts."""
+    party = []
+    for i in range(character_count):
+        character = character_manager.create_character("Hero" + str(i), "Rogue")
+        character["completed_quests"].extend("quest_" + str(q) for q in range(i % 40))
+        party.append(character)
+    names = [character["name"] for character in party]
+
+    print(f"Saving and loading {character_count} characters (durability=file)")
+    with tempfile.TemporaryDirectory() as folder:
+        for workers in worker_counts:
+            seconds, results = time_call(character_manager.save_characters, party, folder,
+                                         workers, "file")
+            assert all(r["ok"] for r in results)
+            save_rate = character_count / seconds
+            seconds, results = time_call(character_manager.load_characters, names, folder, workers)
+            assert all(r["error"] is None for r in results)
+            print(f"  {workers:>2} workers  {save_rate:10,.0f} saves/s  {character_count / seconds:10,.0f} loads/s")
+
+def bench_cache(block_count=300000):
+    """Compare parsing the quest file with missing and hitting the compiled cache."""
+    with tempfile.TemporaryDirectory() as folder:
+        filename = os.path.join(folder, "quests.txt")
+        write_synthetic_quests(filename, block_count)
+        runs = [("parse, no cache", lambda: game_data.load_quests(filename)),
+                ("cache miss", lambda: game_data.load_quests(filename, use_cache=True)),
+                ("cache hit", lambda: game_data.load_quests(filename, use_cache=True))]
+        print(f"Loading {block_count} quests")
+        for name, load in runs:
+            seconds, quests = time_call(load)
+            assert len(quests) == block_count
+            print(f"  {name:<18} {seconds:8.3f}s")
+
+def bench_watch(block_count=300000):
+    """Compare a full quest load with live reloads after small edits."""
+    with tempfile.TemporaryDirectory() as folder:
+        filename = os.path.join(folder, "quests.txt")
+        write_synthetic_quests(filename, block_count)
+        print(f"Reloading {block_count} quests")
+        seconds, watcher = time_call(game_data.CatalogWatcher, filename, "quests")
+        print(f"  {'first load':<22} {seconds:8.3f}s")
+        seconds = time_call(game_data.load_quests, filename)[0]
+        print(f"  {'full load_quests':<22} {seconds:8.3f}s")
+
+        with open(filename, "a") as f:
+            f.write("QUEST_ID: extra\nTITLE: Extra\nDESCRIPTION: D\nREWARD_XP: 1\n"
+                    "REWARD_GOLD: 1\nREQUIRED_LEVEL: 1\nPREREQUISITE: NONE\n\n")
+        seconds, changes = time_call(watcher.reload)
+        assert changes["added"] == ["extra"]
+        print(f"  {'reload, 1 appended':<22} {seconds:8.3f}s")
+
+        with open(filename, "r") as f:
+            text = f.read()
+        middle = "QUEST_ID: quest_" + str(block_count // 2) + "\nTITLE: Quest number"
+        with open(filename, "w") as f:
+            f.write(text.replace(middle, middle.replace("Quest number", "Renamed quest")))
+        seconds, changes = time_call(watcher.reload)
+        assert changes["changed"] == ["quest_" + str(block_count // 2)]
+        print(f"  {'reload, 1 edited':<22} {seconds:8.3f}s")
+
+def bench_parallel(block_count=300000, worker_counts=(1, 2, 4, 8)):
+    """Compare a serial quest load with parallel loads using more workers."""
+    with tempfile.TemporaryDirectory() as folder:
+        filename = os.path.join(folder, "quests.txt")
+        write_synthetic_quests(filename, block_count)
+        print(f"Loading {block_count} quests on {os.cpu_count()} CPUs")
+        seconds, quests = time_call(game_data.load_quests, filename)
+        print(f"  {'serial load_quests':<22} {seconds:8.3f}s")
+
+        # The part the parent process always does: unpickle what the
+        # workers send and build the records. It limits the speed-up.
+        sent = pickle.dumps([quest.as_tuple() for quest in quests.values()],
+                            protocol=pickle.HIGHEST_PROTOCOL)
+        seconds = time_call(lambda: [game_data.Quest(*row) for row in pickle.loads(sent)])[0]
+        print(f"  {'parent share':<22} {seconds:8.3f}s")
+
+        for workers in worker_counts:
+            seconds, loaded = time_call(game_data.load_catalog_parallel, filename, "quests", workers)
+            assert len(loaded) == block_count
+            print(f"  {str(workers) + ' workers':<22} {seconds:8.3f}s")
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "parse"
+    if command == "parse":
+        bench_parse(int(sys.argv[2]) if len(sys.argv) > 2 else 1000000)
+    elif command == "memory":
+        counts = [int(arg) for arg in sys.argv[2:]] or [100000, 1000000]
+        bench_memory(counts)
+    elif command == "render":
+        bench_render(int(sys.argv[2]) if len(sys.argv) > 2 else 100000)
+    elif command == "save":
+        bench_save(int(sys.argv[2]) if len(sys.argv) > 2 else 2000)
+    elif command == "load":
+        bench_load(int(sys.argv[2]) if len(sys.argv) > 2 else 20000)
+    elif command == "list":
+        bench_list(int(sys.argv[2]) if len(sys.argv) > 2 else 100000)
+    elif command == "bulk":
+        bench_bulk(int(sys.argv[2]) if len(sys.argv) > 2 else 5000)
+    elif command == "cache":
+        bench_cache(int(sys.argv[2]) if len(sys.argv) > 2 else 300000)
+    elif command == "watch":
+        bench_watch(int(sys.argv[2]) if len(sys.argv) > 2 else 300000)
+    elif command == "parallel":
+        bench_parallel(int(sys.argv[2]) if len(sys.argv) > 2 else 300000)
+    else:
+        print("Unknown benchmark: " + command)
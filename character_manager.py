@@ -10,7 +10,13 @@ I have reviewed and studied the project to ensure understanding.
 This module handles character creation, loading, and saving.
 """
 
+import hashlib # Picks the shard folders for save files
 import os # This allows us to work with files on the computer
+import struct # Packing numbers into binary saves
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor # Saving many characters at once
+from urllib.parse import quote, unquote # Safe names in save files and the manifest
 from custom_exceptions import (
     InvalidCharacterClassError,
     CharacterNotFoundError,
@@ -19,6 +25,135 @@ from custom_exceptions import (
     CharacterDeadError
 )
 
+# How far save_character goes to make sure a save reached the disk
+DURABILITY_LEVELS = ("none", "file", "dir")
+
+# Save file formats. Binary saves start with SAVE_MAGIC so load_character
+# can tell them from text saves; see format_binary_save_data for the layout.
+SAVE_FORMATS = ("text", "binary")
+SAVE_MAGIC = b"QCSB"
+SAVE_VERSION = 1
+SAVE_HEADER = struct.Struct("<4sH")      # magic, version
+SAVE_STATS = struct.Struct("<B9q")       # flags, then nine whole-number stats
+SAVE_LENGTH = struct.Struct("<I")        # byte length of a string
+SAVE_LIST_HEADER = struct.Struct("<II")  # item count, byte length of a list
+HAS_QUEST_TOTALS = 1
+HAS_QUEST_PROGRESS = 2
+
+# Save file names and the listing manifest kept next to them
+SAVE_SUFFIX = "_save.txt"
+MANIFEST_FILENAME = "saves_manifest.txt"
+MAX_ENCODED_NAME = 120  # Longest encoded name used as-is in a file name
+MANIFEST_SLACK = 100  # Extra journal lines allowed before the manifest is squashed
+_manifest_lock = threading.RLock()  # One manifest reader/writer at a time
+
+# ============================================================================
+# QUEST LIST CONTAINER
+# ============================================================================
+
+class QuestList:
+    """
+    An ordered set of quest IDs used for active and completed quests.
+
+    Checking "quest_id in quest_list" is instant no matter how many quests
+    are stored, but the order quests were added in is kept and the usual
+    list methods (append, remove, indexing, len, +) still work. Adding a
+    quest that is already in the list does nothing.
+
+    Indexing the first or last quest is instant, but any other index or
+    slice copies the IDs into a list first. It is not a real list, so
+    json.dumps needs list(quest_list).
+    """
+    __slots__ = ("_ids",)
+
+    def __init__(self, quest_ids=()):
+        self._ids = dict.fromkeys(quest_ids)  # Dict keys keep insertion order
+
+    def append(self, quest_id):
+        self._ids[quest_id] = None
+
+    add = append
+
+    def extend(self, quest_ids):
+        for quest_id in quest_ids:
+            self._ids[quest_id] = None
+
+    def remove(self, quest_id):
+        try:
+            del self._ids[quest_id]
+        except KeyError:
+            raise ValueError(f"{quest_id} is not in the quest list")
+
+    def discard(self, quest_id):
+        self._ids.pop(quest_id, None)
+
+    def pop(self, index=-1):
+        quest_id = self[index]
+        del self._ids[quest_id]
+        return quest_id
+
+    def clear(self):
+        self._ids.clear()
+
+    def copy(self):
+        return QuestList(self._ids)
+
+    def index(self, quest_id):
+        for position, existing in enumerate(self._ids):
+            if existing == quest_id:
+                return position
+        raise ValueError(f"{quest_id} is not in the quest list")
+
+    def count(self, quest_id):
+        return 1 if quest_id in self._ids else 0
+
+    def __contains__(self, quest_id):
+        return quest_id in self._ids
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def __reversed__(self):
+        return reversed(self._ids)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __getitem__(self, index):
+        # The ends are the common case (pop, newest quest) and need no copy
+        if index == 0 or index == -1:
+            try:
+                return next(iter(self._ids) if index == 0 else reversed(self._ids))
+            except StopIteration:
+                raise IndexError("quest list index out of range")
+        return list(self._ids)[index]
+
+    def __add__(self, other):
+        if not isinstance(other, (QuestList, list, tuple)):
+            return NotImplemented
+        combined = QuestList(self._ids)
+        combined.extend(other)
+        return combined
+
+    def __radd__(self, other):
+        if not isinstance(other, (list, tuple)):
+            return NotImplemented
+        combined = QuestList(other)
+        combined.extend(self._ids)
+        return combined
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
+
+    def __eq__(self, other):
+        if isinstance(other, (QuestList, list, tuple)):
+            return list(self._ids) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return "QuestList(" + repr(list(self._ids)) + ")"
+
 # ============================================================================
 # CHARACTER MANAGEMENT FUNCTIONS
 # ============================================================================
@@ -62,8 +197,11 @@ def create_character(name, character_class):
         "experience": 0,
         "gold": 100,
         "inventory": [],          # Items the character owns
-        "active_quests": [],      # Quests the character is doing
-        "completed_quests": []    # Quests the character finished
+        "active_quests": QuestList(),      # Quests the character is doing
+        "completed_quests": QuestList(),   # Quests the character finished
+        "quest_xp_earned": 0,     # Running total of XP from quests
+        "quest_gold_earned": 0,   # Running total of gold from quests
+        "quest_progress": {}      # Quest ID -> objective counts
     }
     return character
 
@@ -71,55 +209,246 @@ def create_character(name, character_class):
 # SAVE, LOAD, DELETE FUNCTIONS
 # ============================================================================ 
 
-def save_character(character, save_directory="data/save_games"):
+def save_character(character, save_directory="data/save_games", durability="none", format="text"):
     """
     Save the character to a file so we can load it later.
 
+    The whole save is built in memory, written to a temporary file in one
+    write, and then renamed over the old save. A crash part way through
+    leaves the old save untouched instead of a cut-off file.
+
     Args:
         character (dict): Character info.
         save_directory (str): Folder to save the file.
+        durability (str): How hard to push the save to disk before returning:
+            "none" leaves it to the operating system (fastest),
+            "file" fsyncs the save file,
+            "dir" fsyncs the file and the folder so the rename itself
+            survives a power cut (slowest).
+        format (str): "text" for the readable format or "binary" for the
+            compact one. load_character reads either.
 
     Returns:
         bool: True if saved successfully.
+
+    Raises:
+        ValueError: If durability or format is not one of the options above.
     """
-    # Make the folder if it does not exist
-    if not os.path.exists(save_directory):
-        os.makedirs(save_directory)
+    if durability not in DURABILITY_LEVELS:
+        raise ValueError("Unknown durability level: " + str(durability))
+    if format not in SAVE_FORMATS:
+        raise ValueError("Unknown save format: " + str(format))
 
-    filename = os.path.join(save_directory, character["name"] + "_save.txt")
+    # Make the folder if it does not exist
+    make_directories(save_directory, durability)
 
     try:
-        # Open the file for writing (this will create the file)
-        f = open(filename, "w")
-
-        # Save each piece of info as text
-        f.write("NAME: " + character["name"] + "\n")
-        f.write("CLASS: " + character["class"] + "\n")
-        f.write("LEVEL: " + str(character["level"]) + "\n")
-        f.write("HEALTH: " + str(character["health"]) + "\n")
-        f.write("MAX_HEALTH: " + str(character["max_health"]) + "\n")
-        f.write("STRENGTH: " + str(character["strength"]) + "\n")
-        f.write("MAGIC: " + str(character["magic"]) + "\n")
-        f.write("EXPERIENCE: " + str(character["experience"]) + "\n")
-        f.write("GOLD: " + str(character["gold"]) + "\n")
+        manifest_fresh = is_save_manifest_fresh(save_directory)
+        entry = write_character_save(character, save_directory, durability, format)
+    except Exception:
+        return False
+
+    # Keep the listing manifest in step with the new save
+    record_in_save_manifest(save_directory, manifest_fresh, [format_manifest_line(entry)])
+    return True
+
+def write_character_save(character, save_directory, durability, format):
+    """
+    Write one character's save file (the folder must already exist).
+
+    Returns:
+        dict: The character's manifest entry
+    """
+    filename = get_save_filename(character["name"], save_directory)
+    if format == "binary":
+        data = format_binary_save_data(character)
+    else:
+        data = format_save_data(character)
+    make_directories(os.path.dirname(filename), durability)
+    write_file_atomically(filename, data, durability)
+    entry = make_manifest_entry(character["name"], character["class"],
+                                character["level"], os.stat(filename))
+
+    # An old flat save is replaced by the new sharded one
+    flat_filename = get_flat_save_filename(character["name"], save_directory)
+    if flat_filename is not None and os.path.exists(flat_filename):
+        os.remove(flat_filename)
+    return entry
+
+def format_save_data(character):
+    """Return the text of a character's save file."""
+    # Save each piece of info as text
+    lines = [
+        "NAME: " + character["name"],
+        "CLASS: " + character["class"],
+        "LEVEL: " + str(character["level"]),
+        "HEALTH: " + str(character["health"]),
+        "MAX_HEALTH: " + str(character["max_health"]),
+        "STRENGTH: " + str(character["strength"]),
+        "MAGIC: " + str(character["magic"]),
+        "EXPERIENCE: " + str(character["experience"]),
+        "GOLD: " + str(character["gold"]),
 
         # Save lists as comma-separated strings
-        f.write("INVENTORY: " + ",".join(character["inventory"]) + "\n")
-        f.write("ACTIVE_QUESTS: " + ",".join(character["active_quests"]) + "\n")
-        f.write("COMPLETED_QUESTS: " + ",".join(character["completed_quests"]) + "\n")
+        "INVENTORY: " + ",".join(character["inventory"]),
+        "ACTIVE_QUESTS: " + ",".join(character["active_quests"]),
+        "COMPLETED_QUESTS: " + ",".join(character["completed_quests"])
+    ]
 
-        f.close()  # Close the file
-        return True
-    except Exception:
-        return False
+    # Save running quest totals if the character has them
+    if "quest_xp_earned" in character and "quest_gold_earned" in character:
+        lines.append("QUEST_XP_EARNED: " + str(character["quest_xp_earned"]))
+        lines.append("QUEST_GOLD_EARNED: " + str(character["quest_gold_earned"]))
+
+    # Save objective progress like "goblin_hunter:2,orc_menace:1|0"
+    if "quest_progress" in character:
+        lines.append("QUEST_PROGRESS: " + format_quest_progress(character["quest_progress"]))
+
+    return "\n".join(lines) + "\n"
+
+def format_binary_save_data(character):
+    """
+    Return the bytes of a character's save file in the binary format.
+
+    Layout (little-endian):
+        header   magic b"QCSB", uint16 version
+        stats    uint8 flags, then int64 level, health, max_health, strength,
+                 magic, experience, gold, quest_xp_earned, quest_gold_earned
+        strings  name, class and (if flagged) quest progress, each as
+                 uint32 byte length + UTF-8
+        lists    inventory, active quests, completed quests, each as
+                 uint32 count + uint32 byte length + NUL-separated UTF-8
+    """
+    flags = 0
+    if "quest_xp_earned" in character and "quest_gold_earned" in character:
+        flags |= HAS_QUEST_TOTALS
+    if "quest_progress" in character:
+        flags |= HAS_QUEST_PROGRESS
+
+    parts = [
+        SAVE_HEADER.pack(SAVE_MAGIC, SAVE_VERSION),
+        SAVE_STATS.pack(flags, character["level"], character["health"], character["max_health"],
+                        character["strength"], character["magic"], character["experience"],
+                        character["gold"], character.get("quest_xp_earned", 0),
+                        character.get("quest_gold_earned", 0))
+    ]
+    strings = [character["name"], character["class"]]
+    if flags & HAS_QUEST_PROGRESS:
+        strings.append(format_quest_progress(character["quest_progress"]))
+    for text in strings:
+        encoded = text.encode("utf-8")
+        parts.append(SAVE_LENGTH.pack(len(encoded)))
+        parts.append(encoded)
+    for field in ["inventory", "active_quests", "completed_quests"]:
+        values = list(character[field])
+        encoded = "\0".join(values).encode("utf-8")
+        parts.append(SAVE_LIST_HEADER.pack(len(values), len(encoded)))
+        parts.append(encoded)
+    return b"".join(parts)
+
+def write_file_atomically(filename, data, durability="none"):
+    """
+    Replace filename with data (str or bytes) so readers see either the old
+    file or the new one, never half of each.
+
+    Raises:
+        OSError: If the file could not be written. The old file is kept.
+    """
+    folder = os.path.dirname(filename) or "."
+    mode = "wb" if isinstance(data, bytes) else "w"
+
+    # Keep the old file's permissions; new files get what open() would give
+    try:
+        permissions = os.stat(filename).st_mode & 0o777
+    except OSError:
+        permissions = None
+
+    fd, temp_file = create_temp_file(filename)
+    try:
+        if permissions is not None:
+            os.chmod(temp_file, permissions)
+        with os.fdopen(fd, mode) as f:
+            f.write(data)
+            if durability != "none":
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_file, filename)  # Swap in the finished file
+    except BaseException:
+        try:
+            os.remove(temp_file)
+        except OSError:
+            pass
+        raise
+
+    if durability == "dir":
+        sync_directory(folder)
+
+def create_temp_file(filename):
+    """
+    Create a new, uniquely named temp file next to filename.
+
+    The file is made with mode 0o666 like open() does, so the kernel applies
+    the process umask (tempfile.mkstemp would always give 0o600).
+
+    Returns:
+        tuple: (open file descriptor, temp file path)
+    """
+    flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, "O_BINARY", 0)
+    while True:
+        temp_file = filename + "." + os.urandom(6).hex() + ".tmp"
+        try:
+            return os.open(temp_file, flags, 0o666), temp_file
+        except FileExistsError:
+            continue  # Someone else picked the same name; try another
+
+def make_directories(path, durability="none"):
+    """
+    Create a folder and any missing parents, like os.makedirs.
+
+    With durability "dir" the parent of every folder created here is
+    fsynced, so a new shard folder cannot vanish in a power cut and take
+    the save inside it along.
+    """
+    missing = []
+    while path and not os.path.isdir(path):
+        missing.append(path)
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+
+    for folder in reversed(missing):
+        try:
+            os.mkdir(folder)
+        except FileExistsError:
+            pass  # Made by another save at the same moment
+        if durability == "dir":
+            sync_directory(os.path.dirname(folder) or ".")
+
+def sync_directory(folder):
+    """fsync a folder so renames inside it are on disk (skipped where unsupported)."""
+    try:
+        fd = os.open(folder, os.O_RDONLY)
+    except OSError:
+        return  # Windows cannot open folders; its renames are already journaled
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
 
-def load_character(character_name, save_directory="data/save_games"):
+def load_character(character_name, save_directory="data/save_games", quest_data_dict=None):
     """
     Load a character from a save file so we can play again.
 
     Args:
         character_name (str): Name of the character.
         save_directory (str): Folder where the file is.
+        quest_data_dict (dict): Optional quest data. Older saves have no
+            quest reward totals; if this is given they are rebuilt from the
+            completed quests right away, otherwise quest_handler rebuilds
+            them the first time they are needed.
 
     Returns:
         dict: Character info.
@@ -129,27 +458,94 @@ def load_character(character_name, save_directory="data/save_games"):
         SaveFileCorruptedError: File cannot be read.
         InvalidSaveDataError: File has missing or wrong data.
     """
-    filename = os.path.join(save_directory, character_name + "_save.txt")
-    if not os.path.exists(filename):
+    filename = find_save_file(character_name, save_directory)
+    if filename is None:
         raise CharacterNotFoundError(f"No save file for {character_name}")
 
     try:
-        f = open(filename, "r")
-        lines = f.readlines()
-        f.close()
+        with open(filename, "rb") as f:
+            raw = f.read()
     except Exception:
         raise SaveFileCorruptedError("Could not read save file")
 
+    # Binary saves start with a magic header; anything else is a text save
+    if raw.startswith(SAVE_MAGIC):
+        data = parse_binary_save_data(raw)
+    else:
+        try:
+            text = raw.decode("utf-8")
+        except UnicodeDecodeError:
+            raise SaveFileCorruptedError("Could not read save file")
+        data = parse_save_data(text)
+
+    character = {
+        "name": data["name"],
+        "class": data["class"],
+        "level": data["level"],
+        "health": data["health"],
+        "max_health": data["max_health"],
+        "strength": data["strength"],
+        "magic": data["magic"],
+        "experience": data["experience"],
+        "gold": data["gold"],
+        "inventory": data["inventory"],
+        "active_quests": data["active_quests"],
+        "completed_quests": data["completed_quests"]
+    }
+
+    # Objective progress (missing in older saves)
+    if "quest_progress" in data:
+        character["quest_progress"] = parse_quest_progress(data["quest_progress"])
+
+    # Running quest reward totals (missing in older saves)
+    if "quest_xp_earned" in data and "quest_gold_earned" in data:
+        character["quest_xp_earned"] = data["quest_xp_earned"]
+        character["quest_gold_earned"] = data["quest_gold_earned"]
+    elif quest_data_dict is not None:
+        totals = count_quest_rewards(character["completed_quests"], quest_data_dict)
+        character["quest_xp_earned"] = totals["total_xp"]
+        character["quest_gold_earned"] = totals["total_gold"]
+
+    return character
+
+def count_quest_rewards(completed_quests, quest_data_dict):
+    """
+    Add up the XP and gold rewards of completed quests.
+
+    This is the one place the recount is done; quest_handler uses it too,
+    so rebuilt totals and the drift check always agree. Unknown quest IDs
+    count as zero.
+
+    Returns:
+        dict: {"total_xp": ..., "total_gold": ...}
+    """
+    total_xp = 0
+    total_gold = 0
+    for quest_id in completed_quests:
+        quest = quest_data_dict.get(quest_id, {})
+        total_xp += quest.get("reward_xp", 0)
+        total_gold += quest.get("reward_gold", 0)
+    return {"total_xp": total_xp, "total_gold": total_gold}
+
+def parse_save_data(text):
+    """
+    Turn the text of a text save file into a dictionary of its fields.
+
+    Raises:
+        InvalidSaveDataError: If a line or number is not valid.
+    """
     data = {}
-    for line in lines:
+    for line in text.splitlines(True):
         if ":" not in line:
             raise InvalidSaveDataError(f"Invalid line: {line}")
         key, value = line.strip().split(":", 1)
         value = value.strip()
 
         # Turn comma-separated lists back into lists
-        if key in ["INVENTORY", "ACTIVE_QUESTS", "COMPLETED_QUESTS"]:
+        if key == "INVENTORY":
             data[key.lower()] = value.split(",") if value else []
+        elif key in ["ACTIVE_QUESTS", "COMPLETED_QUESTS"]:
+            data[key.lower()] = QuestList(value.split(",") if value else [])
         else:
             data[key.lower()] = value
 
@@ -160,20 +556,101 @@ def load_character(character_name, save_directory="data/save_games"):
         except Exception:
             raise InvalidSaveDataError(f"Invalid number for {field}")
 
-    return {
-        "name": data["name"],
-        "class": data["class"],
-        "level": data["level"],
-        "health": data["health"],
-        "max_health": data["max_health"],
-        "strength": data["strength"],
-        "magic": data["magic"],
-        "experience": data["experience"],
-        "gold": data["gold"],
-        "inventory": data["inventory"],
-        "active_quests": data["active_quests"],
-        "completed_quests": data["completed_quests"]
+    # Running quest reward totals (missing in older saves)
+    if "quest_xp_earned" in data and "quest_gold_earned" in data:
+        for field in ["quest_xp_earned", "quest_gold_earned"]:
+            try:
+                data[field] = int(data[field])
+            except Exception:
+                raise InvalidSaveDataError(f"Invalid number for {field}")
+
+    return data
+
+def parse_binary_save_data(raw):
+    """
+    Turn the bytes of a binary save file into a dictionary of its fields.
+    See format_binary_save_data for the layout.
+
+    Raises:
+        InvalidSaveDataError: If the save is cut off, damaged, or from a
+            newer version of the game.
+    """
+    try:
+        magic, version = SAVE_HEADER.unpack_from(raw, 0)
+        if version > SAVE_VERSION:
+            raise InvalidSaveDataError(f"Unsupported save version: {version}")
+
+        offset = SAVE_HEADER.size
+        stats = SAVE_STATS.unpack_from(raw, offset)
+        offset += SAVE_STATS.size
+        flags = stats[0]
+
+        strings = []
+        for _ in range(3 if flags & HAS_QUEST_PROGRESS else 2):
+            length = SAVE_LENGTH.unpack_from(raw, offset)[0]
+            offset += SAVE_LENGTH.size
+            strings.append(raw[offset:offset + length].decode("utf-8"))
+            offset += length
+
+        lists = []
+        for _ in range(3):
+            count, length = SAVE_LIST_HEADER.unpack_from(raw, offset)
+            offset += SAVE_LIST_HEADER.size
+            values = raw[offset:offset + length].decode("utf-8").split("\0") if count else []
+            if len(values) != count:
+                raise InvalidSaveDataError("Damaged list in binary save")
+            lists.append(values)
+            offset += length
+    except (struct.error, UnicodeDecodeError):
+        raise InvalidSaveDataError("Damaged binary save")
+    if offset != len(raw):
+        raise InvalidSaveDataError("Damaged binary save")
+
+    data = {
+        "name": strings[0],
+        "class": strings[1],
+        "level": stats[1],
+        "health": stats[2],
+        "max_health": stats[3],
+        "strength": stats[4],
+        "magic": stats[5],
+        "experience": stats[6],
+        "gold": stats[7],
+        "inventory": lists[0],
+        "active_quests": QuestList(lists[1]),
+        "completed_quests": QuestList(lists[2])
     }
+    if flags & HAS_QUEST_TOTALS:
+        data["quest_xp_earned"] = stats[8]
+        data["quest_gold_earned"] = stats[9]
+    if flags & HAS_QUEST_PROGRESS:
+        data["quest_progress"] = strings[2]
+    return data
+
+def format_quest_progress(progress):
+    """Turn {quest ID: [counts]} into text like "goblin_hunter:2,orc_menace:1|0"."""
+    return ",".join(quest_id + ":" + "|".join(str(count) for count in counts)
+                    for quest_id, counts in progress.items())
+
+def parse_quest_progress(text):
+    """
+    Turn text from format_quest_progress back into {quest ID: [counts]}.
+
+    Raises:
+        InvalidSaveDataError: If the text is not in the right format.
+    """
+    progress = {}
+    if not text:
+        return progress
+    for entry in text.split(","):
+        quest_id, colon, counts = entry.rpartition(":")
+        if not colon or not quest_id:
+            raise InvalidSaveDataError("Invalid quest progress: " + entry)
+        try:
+            progress[quest_id] = [int(count) for count in counts.split("|")]
+        except ValueError:
+            raise InvalidSaveDataError("Invalid quest progress: " + entry)
+    return progress
 
 def delete_character(character_name, save_directory="data/save_games"):
     """
@@ -186,15 +663,386 @@ def delete_character(character_name, save_directory="data/save_games"):
     Returns:
         bool: True if file deleted, False if not found.
     """
-    filename = os.path.join(save_directory, character_name + "_save.txt")
-    if os.path.exists(filename):
+    filenames = [get_save_filename(character_name, save_directory),
+                 get_flat_save_filename(character_name, save_directory)]
+    filenames = [f for f in filenames if f is not None and os.path.exists(f)]
+    if filenames:
         try:
-            os.remove(filename)
-            return True
+            manifest_fresh = is_save_manifest_fresh(save_directory)
+            for filename in filenames:
+                os.remove(filename)
         except Exception:
             return False
+        record_in_save_manifest(save_directory, manifest_fresh,
+                                ["DELETE\t" + quote(character_name, safe="") + "\n"])
+        return True
     return False
 
+# ============================================================================
+# SAVE FILE LAYOUT
+# ============================================================================
+# Saves live in two levels of folders picked from a hash of the name, e.g.
+#     data/save_games/3f/a2/Sir%20Bob_save.txt
+# so no single folder gets huge. Names are %-encoded so characters such as
+# "/" or ":" cannot break the path, and very long names are cut short and
+# finished with "+" and the full hash ("+" never appears in an encoded name).
+# Saves from before this layout sit directly in the save folder
+# ("flat" saves); they are still found, and migrate_flat_saves moves them.
+
+def get_save_filename(character_name, save_directory="data/save_games"):
+    """Return the path of a character's save file."""
+    digest = hashlib.sha1(character_name.encode("utf-8")).hexdigest()
+    encoded = quote(character_name, safe="")
+    if len(encoded) > MAX_ENCODED_NAME:
+        encoded = encoded[:MAX_ENCODED_NAME // 2] + "+" + digest
+    return os.path.join(save_directory, digest[:2], digest[2:4], encoded + SAVE_SUFFIX)
+
+def get_flat_save_filename(character_name, save_directory="data/save_games"):
+    """
+    Return where the old flat layout kept a character's save, or None if
+    the name could not have been saved that way (it would leave the folder).
+    """
+    if not character_name or "/" in character_name or os.sep in character_name:
+        return None
+    if (os.altsep and os.altsep in character_name) or character_name in (".", ".."):
+        return None
+    return os.path.join(save_directory, character_name + SAVE_SUFFIX)
+
+def find_save_file(character_name, save_directory="data/save_games"):
+    """Return the path of an existing save for the character, or None."""
+    filename = get_save_filename(character_name, save_directory)
+    if os.path.exists(filename):
+        return filename
+    filename = get_flat_save_filename(character_name, save_directory)
+    if filename is not None and os.path.exists(filename):
+        return filename
+    return None
+
+def is_shard_name(name):
+    """Return True if a folder name looks like a two-letter hex shard."""
+    return len(name) == 2 and all(c in "0123456789abcdef" for c in name)
+
+def iter_save_files(save_directory):
+    """
+    Yield (character name or None, os.DirEntry) for every save file,
+    sharded ones first. The name is None when it was shortened and has to
+    be read from the save itself.
+    """
+    with os.scandir(save_directory) as top:
+        top_entries = list(top)
+
+    for first in top_entries:
+        if not is_shard_name(first.name) or not first.is_dir():
+            continue
+        with os.scandir(first.path) as middle:
+            for second in middle:
+                if not is_shard_name(second.name) or not second.is_dir():
+                    continue
+                with os.scandir(second.path) as files:
+                    for dir_entry in files:
+                        if dir_entry.name.endswith(SAVE_SUFFIX) and dir_entry.is_file():
+                            encoded = dir_entry.name[:-len(SAVE_SUFFIX)]
+                            yield (None if "+" in encoded else unquote(encoded)), dir_entry
+
+    for dir_entry in top_entries:
+        if dir_entry.name.endswith(SAVE_SUFFIX) and dir_entry.is_file():
+            yield dir_entry.name[:-len(SAVE_SUFFIX)], dir_entry
+
+def migrate_flat_saves(save_directory="data/save_games"):
+    """
+    Move saves from the old flat layout into the sharded layout.
+
+    A flat save is left where it is if the character already has a sharded
+    save (that one is newer, since saving removes the flat copy).
+
+    Returns:
+        dict: {"moved": [names], "skipped": [names]}
+    """
+    moved = []
+    skipped = []
+    if not os.path.isdir(save_directory):
+        return {"moved": moved, "skipped": skipped}
+
+    with os.scandir(save_directory) as top:
+        flat_files = [e for e in top if e.name.endswith(SAVE_SUFFIX) and e.is_file()]
+    for dir_entry in flat_files:
+        name = dir_entry.name[:-len(SAVE_SUFFIX)]
+        target = get_save_filename(name, save_directory)
+        if os.path.exists(target):
+            skipped.append(name)
+            continue
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(dir_entry.path, target)
+        moved.append(name)
+
+    rebuild_save_manifest(save_directory, read_save_manifest(save_directory))
+    return {"moved": sorted(moved), "skipped": sorted(skipped)}
+
+# ============================================================================
+# BULK SAVE AND LOAD
+# ============================================================================
+# Saving or loading is mostly waiting on the disk, so threads let many
+# characters be written or read at the same time. One bad character or file
+# only fails its own entry in the results.
+
+def save_characters(characters, save_directory="data/save_games", workers=None,
+                    durability="none", format="text"):
+    """
+    Save many characters at once using a pool of threads.
+
+    Args:
+        characters: Iterable of character dicts
+        save_directory (str): Folder to save the files.
+        workers (int): Number of threads (None lets Python choose).
+        durability, format: Same as save_character.
+
+    Returns:
+        list: One dict per character, in the same order, with the keys
+            name, ok (True if saved) and error (the exception, or None).
+
+    Raises:
+        ValueError: If durability or format is not valid.
+    """
+    if durability not in DURABILITY_LEVELS:
+        raise ValueError("Unknown durability level: " + str(durability))
+    if format not in SAVE_FORMATS:
+        raise ValueError("Unknown save format: " + str(format))
+    characters = list(characters)
+
+    # Make the folder if it does not exist
+    make_directories(save_directory, durability)
+
+    manifest_fresh = is_save_manifest_fresh(save_directory)
+    with ThreadPoolExecutor(workers) as pool:
+        futures = [pool.submit(write_character_save, character, save_directory, durability, format)
+                   for character in characters]
+
+    results = []
+    lines = []
+    for character, future in zip(characters, futures):
+        error = future.exception()
+        name = character.get("name") if isinstance(character, dict) else None
+        results.append({"name": name, "ok": error is None, "error": error})
+        if error is None:
+            lines.append(format_manifest_line(future.result()))
+
+    # One manifest update for the whole batch, after every file is in place
+    record_in_save_manifest(save_directory, manifest_fresh, lines)
+    return results
+
+def load_characters(character_names, save_directory="data/save_games", workers=None,
+                    quest_data_dict=None):
+    """
+    Load many characters at once using a pool of threads.
+
+    Args:
+        character_names: Iterable of character names
+        save_directory (str): Folder where the files are.
+        workers (int): Number of threads (None lets Python choose).
+        quest_data_dict (dict): Passed on to load_character.
+
+    Returns:
+        list: One dict per name, in the same order, with the keys
+            name, character (the loaded dict, or None) and error
+            (the exception, or None).
+    """
+    character_names = list(character_names)
+    with ThreadPoolExecutor(workers) as pool:
+        futures = [pool.submit(load_character, name, save_directory, quest_data_dict)
+                   for name in character_names]
+
+    results = []
+    for name, future in zip(character_names, futures):
+        error = future.exception()
+        results.append({"name": name,
+                        "character": future.result() if error is None else None,
+                        "error": error})
+    return results
+
+# ============================================================================
+# SAVE MANIFEST
+# ============================================================================
+# The manifest is a small journal file in the top save folder with one line per
+# save or delete:
+#     SAVE<tab>name<tab>class<tab>level<tab>size<tab>mtime
+#     DELETE<tab>name
+# so the load screen can list every character without opening their saves.
+# save_character and delete_character append to it. If anything else
+# changed the top folder (its modification time is newer than the
+# manifest's), or a line is damaged, the manifest is rebuilt from a folder
+# scan. Changes made by hand inside the shard folders do not touch the top
+# folder, so they are only picked up by list_saved_characters(repair=True);
+# main.load_game does that when a listed save cannot be loaded. Checking
+# every shard folder instead would cost about as much as the scan itself.
+# Saves whose size and modification time still match their old entry are
+# not reopened during a rebuild.
+
+def list_saved_characters(save_directory="data/save_games", repair=False):
+    """
+    List every saved character without opening their save files.
+
+    Args:
+        save_directory (str): Folder where the saves are.
+        repair (bool): Rescan the folder even if the manifest looks fresh.
+            Needed after saves inside the shard folders were changed by hand,
+            since only the top folder's modification time is checked (for
+            example when a listed save turns out to be missing).
+
+    Returns:
+        list: One dict per save, sorted by name, with the keys
+            name, class, level, size (bytes) and mtime (nanoseconds).
+    """
+    if not os.path.isdir(save_directory):
+        return []
+    if repair:
+        entries = rebuild_save_manifest(save_directory, replay_save_manifest(
+            os.path.join(save_directory, MANIFEST_FILENAME))[0])
+    else:
+        entries = read_save_manifest(save_directory)
+    return [entries[name] for name in sorted(entries)]
+
+def read_save_manifest(save_directory):
+    """
+    Return {name: entry} from the manifest, repairing it first if it is stale.
+    """
+    manifest = os.path.join(save_directory, MANIFEST_FILENAME)
+    # Saves append to the journal under the same lock, so none can land
+    # between reading the manifest and replacing it
+    with _manifest_lock:
+        fresh = is_save_manifest_fresh(save_directory)
+        entries, line_count, damaged = replay_save_manifest(manifest)
+
+        if not fresh or damaged:
+            return rebuild_save_manifest(save_directory, entries)
+        if line_count > 2 * len(entries) + MANIFEST_SLACK:
+            write_save_manifest(save_directory, entries)  # Squash old journal lines
+        return entries
+
+def is_save_manifest_fresh(save_directory):
+    """Return True if nothing has changed in the folder since the manifest was written."""
+    try:
+        manifest_time = os.stat(os.path.join(save_directory, MANIFEST_FILENAME)).st_mtime_ns
+        return os.stat(save_directory).st_mtime_ns <= manifest_time
+    except OSError:
+        return False
+
+def replay_save_manifest(manifest):
+    """
+    Read the manifest's journal lines in order.
+
+    Returns:
+        tuple: (entries by name, number of lines, True if a line was damaged)
+    """
+    entries = {}
+    line_count = 0
+    try:
+        with open(manifest, "r", encoding="utf-8") as f:
+            for line in f:
+                line_count += 1
+                parts = line.rstrip("\n").split("\t")
+                try:
+                    if parts[0] == "SAVE" and len(parts) == 6:
+                        name = unquote(parts[1])
+                        entries[name] = {"name": name, "class": unquote(parts[2]),
+                                         "level": int(parts[3]), "size": int(parts[4]),
+                                         "mtime": int(parts[5])}
+                    elif parts[0] == "DELETE" and len(parts) == 2:
+                        entries.pop(unquote(parts[1]), None)
+                    else:
+                        return entries, line_count, True
+                except ValueError:
+                    return entries, line_count, True
+    except (OSError, UnicodeDecodeError):
+        return entries, line_count, True
+    return entries, line_count, False
+
+def rebuild_save_manifest(save_directory, known=None):
+    """
+    Scan the save folder and write a fresh manifest.
+
+    Saves whose size and modification time match their entry in known are
+    trusted; only new or changed saves are opened. Saves that cannot be read
+    are left out of the listing.
+
+    Returns:
+        dict: {name: entry} for every readable save
+    """
+    known = known or {}
+    # Hold the lock from the scan to the rewrite: a save journaled in
+    # between could otherwise be missed by the scan and then overwritten
+    with _manifest_lock:
+        entries = {}
+        for name, dir_entry in iter_save_files(save_directory):
+            if name in entries:
+                continue  # A sharded save hides an old flat one
+            stat = dir_entry.stat()
+            old = known.get(name)
+            if old is not None and old["size"] == stat.st_size and old["mtime"] == stat.st_mtime_ns:
+                entries[name] = old
+                continue
+            summary = read_save_summary(dir_entry.path)
+            if summary is None:
+                continue
+            if name is None:
+                name = summary["name"]  # Shortened file name
+                if name in entries or get_save_filename(name, save_directory) != dir_entry.path:
+                    continue
+            entries[name] = make_manifest_entry(name, summary["class"], summary["level"], stat)
+        write_save_manifest(save_directory, entries)
+        return entries
+
+def read_save_summary(filename):
+    """Return a save's fields, or None if it cannot be read."""
+    try:
+        with open(filename, "rb") as f:
+            raw = f.read()
+        if raw.startswith(SAVE_MAGIC):
+            return parse_binary_save_data(raw)
+        return parse_save_data(raw.decode("utf-8"))
+    except (OSError, UnicodeDecodeError, KeyError, InvalidSaveDataError):
+        return None
+
+def write_save_manifest(save_directory, entries):
+    """Replace the manifest with one SAVE line per entry."""
+    manifest = os.path.join(save_directory, MANIFEST_FILENAME)
+    lines = [format_manifest_line(entries[name]) for name in sorted(entries)]
+    with _manifest_lock:
+        try:
+            write_file_atomically(manifest, "".join(lines))
+            # The rename above touched the folder; mark the manifest as newer
+            os.utime(manifest)
+        except OSError:
+            pass  # Listing still works, it will just scan again next time
+
+def record_in_save_manifest(save_directory, manifest_fresh, lines):
+    """
+    Append journal lines for saves or deletes to the manifest.
+
+    If the manifest was already stale before the change, it is removed
+    instead so the next listing rebuilds it rather than trusting it.
+    """
+    manifest = os.path.join(save_directory, MANIFEST_FILENAME)
+    with _manifest_lock:
+        try:
+            if not manifest_fresh:
+                if os.path.exists(manifest):
+                    os.remove(manifest)
+                return
+            with open(manifest, "a", encoding="utf-8") as f:
+                f.write("".join(lines))
+        except OSError:
+            pass  # The folder will look newer than the manifest and get rescanned
+
+def make_manifest_entry(name, character_class, level, stat):
+    """Build a manifest entry from a save's details and its os.stat result."""
+    return {"name": name, "class": character_class, "level": int(level),
+            "size": stat.st_size, "mtime": stat.st_mtime_ns}
+
+def format_manifest_line(entry):
+    """Return the manifest line for an entry."""
+    return ("SAVE\t" + quote(entry["name"], safe="") + "\t" + quote(entry["class"], safe="") +
+            "\t" + str(entry["level"]) + "\t" + str(entry["size"]) + "\t" + str(entry["mtime"]) + "\n")
+
 # ============================================================================ 
 # CHARACTER PROGRESSION
 # ============================================================================ 
@@ -316,8 +1164,11 @@ def validate_character_data(character):
         if field not in character:
             raise InvalidSaveDataError(f"Missing field: {field}")
 
-    for list_field in ["inventory", "active_quests", "completed_quests"]:
-        if not isinstance(character[list_field], list):
+    if not isinstance(character["inventory"], list):
+        raise InvalidSaveDataError("inventory must be a list")
+
+    for list_field in ["active_quests", "completed_quests"]:
+        if not isinstance(character[list_field], (list, QuestList)):
             raise InvalidSaveDataError(f"{list_field} must be a list")
 
     for int_field in ["level", "health", "max_health", "strength", "magic", "experience", "gold"]:
@@ -330,6 +1181,15 @@ def validate_character_data(character):
 # TESTING
 # ============================================================================
 
+if __name__ == "__main__" and len(sys.argv) > 1 and sys.argv[1] == "migrate":
+    # python character_manager.py migrate [save folder]
+    folder = sys.argv[2] if len(sys.argv) > 2 else "data/save_games"
+    report = migrate_flat_saves(folder)
+    print(f"Moved {len(report['moved'])} saves into the sharded layout")
+    for name in report["skipped"]:
+        print("Skipped " + name + " (already has a sharded save)")
+    sys.exit(0)
+
 if __name__ == "__main__":
     print("=== CHARACTER MANAGER TEST ===")
     
@@ -12,21 +12,40 @@ This module handles loading and validating game data from text files.
 """
 
 import os
+import sys
+import hashlib  # Used to fingerprint data files for the cache
+import pickle   # Used to store the compiled catalog cache
+import mmap     # Used to read large item files without loading them
+import re
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate, starmap
+from operator import attrgetter
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from collections.abc import Mapping
 from custom_exceptions import (
     InvalidDataFormatError,  # Raised when data in a file is formatted wrong
     MissingDataFileError,    # Raised when a required file does not exist
     CorruptedDataError       # Raised when a file cannot be read or written
 )
 
+# Bump this whenever the shape of loaded quests/items changes so that old
+# cache files are ignored and rebuilt
+CACHE_VERSION = 5
+
 # ============================================================================
 # DATA LOADING FUNCTIONS
 # ============================================================================
 
-def load_quests(filename="data/quests.txt"):
+def load_quests(filename="data/quests.txt", use_cache=False):
     """
     Load all quests from a text file.
 
     Each quest is separated by a blank line in the file.
+    If use_cache is True, a compiled copy is kept next to the file and
+    reused until the text file changes.
 
     Returns:
         dict: Dictionary of quests where keys are quest IDs
@@ -35,45 +54,21 @@ def load_quests(filename="data/quests.txt"):
         CorruptedDataError: If the file cannot be read
         InvalidDataFormatError: If the data in the file is invalid
     """
-    if not os.path.exists(filename):
-        raise MissingDataFileError("Quest file not found: " + filename)
-
-    try:
-        with open(filename, "r") as f:
-            lines = f.readlines()
-    except Exception:
-        raise CorruptedDataError("Unable to read quest file")
+    if use_cache:
+        return load_with_cache(filename, load_quests)
 
     quests = {}  # Dictionary to hold all quests
-    block = []   # Temporary list to hold lines for a single quest
-
-    # Process each line in the file
-    for line in lines:
-        stripped = line.strip()  # Remove extra spaces
-
-        if stripped == "":
-            # Blank line means end of current quest block
-            if block:
-                quest = parse_quest_block(block)
-                validate_quest_data(quest)
-                quests[quest["quest_id"]] = quest
-                block = []
-        else:
-            block.append(stripped)
-
-    # Process last block if file does not end with a blank line
-    if block:
-        quest = parse_quest_block(block)
-        validate_quest_data(quest)
+    for quest in iter_quests(filename):
         quests[quest["quest_id"]] = quest
-
     return quests
 
-def load_items(filename="data/items.txt"):
+def load_items(filename="data/items.txt", use_cache=False):
     """
     Load all items from a text file.
 
     Each item is separated by a blank line in the file.
+    If use_cache is True, a compiled copy is kept next to the file and
+    reused until the text file changes.
 
     Returns:
         dict: Dictionary of items where keys are item IDs
@@ -82,35 +77,680 @@ def load_items(filename="data/items.txt"):
         CorruptedDataError: If the file cannot be read
         InvalidDataFormatError: If the data in the file is invalid
     """
+    if use_cache:
+        return load_with_cache(filename, load_items)
+
+    items = {}
+    for item in iter_items(filename):
+        items[item["item_id"]] = item
+    return items
+
+def iter_quests(filename="data/quests.txt"):
+    """
+    Yield quests from a text file one at a time.
+
+    Blocks are read straight off the file handle, so only one quest is in
+    memory at a time and the caller can stop early.
+
+    Yields:
+        Quest: One validated quest
+    Raises:
+        MissingDataFileError: If the quests file does not exist
+        CorruptedDataError: If the file cannot be read
+        InvalidDataFormatError: If the data in the file is invalid
+    """
+    for block in iter_blocks(filename, "quest"):
+        yield parse_quest_block(block)
+
+def iter_items(filename="data/items.txt"):
+    """
+    Yield items from a text file one at a time.
+
+    Yields:
+        Item: One validated item
+    Raises:
+        MissingDataFileError: If the items file does not exist
+        CorruptedDataError: If the file cannot be read
+        InvalidDataFormatError: If the data in the file is invalid
+    """
+    for block in iter_blocks(filename, "item"):
+        yield parse_item_block(block)
+
+def iter_blocks(filename, label):
+    """
+    Yield each blank-line separated block of a data file as a list of lines.
+
+    Args:
+        filename (str): Path to the data file
+        label (str): "quest" or "item", used in error messages
+    """
     if not os.path.exists(filename):
-        raise MissingDataFileError("Item file not found: " + filename)
+        raise MissingDataFileError(label.capitalize() + " file not found: " + filename)
 
     try:
-        with open(filename, "r") as f:
-            lines = f.readlines()
+        f = open(filename, "r")
     except Exception:
-        raise CorruptedDataError("Unable to read item file")
+        raise CorruptedDataError("Unable to read " + label + " file")
 
-    items = {}
-    block = []
-
-    for line in lines:
-        stripped = line.strip()
-        if stripped == "":
-            if block:
-                item = parse_item_block(block)
-                validate_item_data(item)
-                items[item["item_id"]] = item
-                block = []
+    with f:
+        block = []  # Lines for the block we are currently reading
+        try:
+            for line in f:
+                stripped = line.strip()  # Remove extra spaces
+
+                if stripped == "":
+                    # Blank line means end of current block
+                    if block:
+                        yield block
+                        block = []
+                else:
+                    block.append(stripped)
+        except (OSError, UnicodeDecodeError):
+            raise CorruptedDataError("Unable to read " + label + " file")
+
+        # Process last block if file does not end with a blank line
+        if block:
+            yield block
+
+# ============================================================================
+# COMPILED CATALOG CACHE
+# ============================================================================
+
+def get_cache_filename(filename):
+    """Return the path of the compiled cache file for a data file."""
+    return filename + ".cache"
+
+def load_with_cache(filename, loader):
+    """
+    Load a catalog from its compiled cache, or parse it and write the cache.
+
+    Args:
+        filename (str): Path to the text data file
+        loader (function): load_quests or load_items, used on a cache miss
+
+    Returns:
+        dict: The loaded catalog
+    """
+    cached = read_catalog_cache(filename)
+    if cached is not None:
+        return cached
+
+    # Take the fingerprint before parsing so an edit made while we parse
+    # makes the cache look stale instead of silently wrong
+    try:
+        signature = get_file_signature(filename)
+        content_hash = hash_file(filename)
+    except OSError:
+        signature = None  # Let the loader raise the proper error
+
+    data = loader(filename)
+    if signature is not None:
+        write_catalog_cache(filename, data, signature, content_hash)
+    return data
+
+def get_file_signature(filename):
+    """Return (size, mtime in nanoseconds) for a file."""
+    info = os.stat(filename)
+    return info.st_size, info.st_mtime_ns
+
+def hash_file(filename):
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def read_catalog_cache(filename):
+    """
+    Return the cached catalog for a data file, or None if it is missing or stale.
+
+    The cache is valid when its version and the file size match and either
+    the modification time or the content hash still matches. When only the
+    hash matches, the cache is rewritten with the new modification time so
+    later loads can skip hashing again.
+    """
+    try:
+        with open(get_cache_filename(filename), "rb") as f:
+            payload = pickle.load(f)
+        size, mtime = get_file_signature(filename)
+    except Exception:
+        return None
+
+    if not isinstance(payload, dict) or payload.get("version") != CACHE_VERSION:
+        return None
+    if payload.get("size") != size:
+        return None
+    if payload.get("mtime") != mtime:
+        # File was touched; only trust the cache if the content is the same
+        try:
+            content_hash = hash_file(filename)
+        except OSError:
+            return None
+        if content_hash != payload.get("hash"):
+            return None
+        write_catalog_cache(filename, payload.get("data"), (size, mtime), content_hash)
+    return payload.get("data")
+
+def write_catalog_cache(filename, data, signature, content_hash):
+    """
+    Save a compiled catalog next to its data file.
+
+    Writing the cache is best effort: if it fails the game still works,
+    it just parses the text file again next time.
+    """
+    payload = {
+        "version": CACHE_VERSION,
+        "size": signature[0],
+        "mtime": signature[1],
+        "hash": content_hash,
+        "data": data
+    }
+    cache_file = get_cache_filename(filename)
+    temp_file = cache_file + ".tmp"
+    try:
+        with open(temp_file, "wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_file, cache_file)  # Swap in the finished file
+        return True
+    except Exception:
+        try:
+            os.remove(temp_file)
+        except OSError:
+            pass
+        return False
+
+# ============================================================================
+# PARALLEL CATALOG LOADING
+# ============================================================================
+
+# Files smaller than this are parsed in the current process because
+# starting worker processes would take longer than the parsing itself
+MIN_PARALLEL_FILE_SIZE = 1024 * 1024
+
+def get_catalog_kind(kind):
+    """
+    Return (label, id field, block parser, record class) for "quests" or "items".
+
+    Raises:
+        ValueError: If kind is not a known catalog type
+    """
+    if kind == "quests":
+        return "quest", "quest_id", parse_quest_block, Quest
+    elif kind == "items":
+        return "item", "item_id", parse_item_block, Item
+    raise ValueError("Unknown catalog kind: " + str(kind))
+
+def load_catalog_parallel(filename, kind, workers=None,
+                          min_parallel_size=MIN_PARALLEL_FILE_SIZE):
+    """
+    Load a quest or item catalog by parsing pieces of the file in parallel.
+
+    The file is split into byte ranges that always end on a blank line, so
+    no block is cut in half. Each range is parsed in a worker process and
+    the results are merged in file order.
+
+    Args:
+        filename (str): Path to the data file
+        kind (str): "quests" or "items"
+        workers (int): Number of worker processes (defaults to CPU count)
+        min_parallel_size (int): Smaller files are parsed without workers
+
+    Returns:
+        dict: Catalog where keys are quest or item IDs
+    Raises:
+        MissingDataFileError: If the file does not exist
+        CorruptedDataError: If the file cannot be read
+        InvalidDataFormatError: If any block is invalid or an ID repeats
+    """
+    label, id_field, parser, record_type = get_catalog_kind(kind)
+    if not os.path.exists(filename):
+        raise MissingDataFileError(label.capitalize() + " file not found: " + filename)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    try:
+        size = os.path.getsize(filename)
+        if workers <= 1 or size < min_parallel_size:
+            records = parse_catalog_shard(filename, kind, 0, size)
+        else:
+            ranges = find_shard_ranges(filename, workers)
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(parse_catalog_shard_values, filename, kind, start, end)
+                           for start, end in ranges]
+                # Collect in file order so errors match a normal load
+                rows = [row for future in futures for row in future.result()]
+            # Building the records here is the part no worker can do for us
+            records = list(starmap(record_type, rows))
+    except OSError:
+        raise CorruptedDataError("Unable to read " + label + " file")
+
+    record_ids = list(map(attrgetter(id_field), records))
+    catalog = dict(zip(record_ids, records))
+    if len(catalog) != len(records):
+        # Some ID repeats; report the first one, like a normal load
+        seen = set()
+        for record_id in record_ids:
+            if record_id in seen:
+                raise InvalidDataFormatError("Duplicate " + label + " ID: " + record_id)
+            seen.add(record_id)
+    return catalog
+
+def find_shard_ranges(filename, shard_count):
+    """
+    Split a data file into about shard_count (start, end) byte ranges.
+
+    Every range except the last ends just after a blank line.
+    """
+    size = os.path.getsize(filename)
+    boundaries = [0]
+    with open(filename, "rb") as f:
+        for i in range(1, shard_count):
+            position = max(size * i // shard_count, boundaries[-1])
+            f.seek(position)
+            f.readline()  # Skip the rest of the line we landed in
+            while True:
+                line = f.readline()
+                if not line or line.strip() == b"":
+                    break
+            boundary = f.tell()
+            if boundary >= size:
+                break
+            if boundary > boundaries[-1]:
+                boundaries.append(boundary)
+    boundaries.append(size)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+def parse_catalog_shard(filename, kind, start, end):
+    """
+    Parse and validate the blocks in one byte range of a data file.
+
+    Returns:
+        list: Records in the order they appear in the range
+    """
+    label = get_catalog_kind(kind)[0]
+    with open(filename, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError:
+        raise CorruptedDataError("Unable to read " + label + " file")
+    return parse_catalog_text(text, kind)
+
+def parse_catalog_shard_values(filename, kind, start, end):
+    """
+    Like parse_catalog_shard, but return each record as a plain tuple of
+    its values in slot order. Worker processes send these back because
+    plain tuples are smaller and quicker to unpickle than records.
+    """
+    return [record.as_tuple() for record in parse_catalog_shard(filename, kind, start, end)]
+
+def parse_catalog_text(text, kind):
+    """
+    Parse every block in a string holding quest or item file contents.
+
+    This scans the whole buffer with a regular expression instead of
+    walking it line by line, which is faster when the text is already in
+    memory.
+
+    Returns:
+        list: Validated records in the order they appear
+    """
+    parser = get_catalog_kind(kind)[2]
+    records = []
+    for match in BLOCK_TEXT_PATTERN.finditer(text):
+        records.append(parser([line.strip() for line in match.group().splitlines()]))
+    return records
+
+# ============================================================================
+# LIVE CATALOG RELOADING
+# ============================================================================
+
+class CatalogWatcher:
+    """
+    Keep a quest or item catalog up to date while the game is running.
+
+    The watcher keeps the file contents it last read and where each block
+    sits in them. When the file changes, the old and new contents are
+    compared from both ends to find the edited span, and only the blocks in that span (plus
+    one neighbour on each side, in case blocks were joined or split) are
+    parsed again. The rest of the catalog is reused as it is, so a reload
+    costs about as much as the edit, apart from reading the file.
+
+    The finished catalog is published by replacing the catalog attribute in
+    one step, so code holding the old dictionary never sees a half-updated
+    one. Edited records keep their place in the dictionary and new ones are
+    added at the end. If the edited file is invalid (including a repeated
+    ID) the old catalog stays in place and the error is raised.
+    """
+
+    def __init__(self, filename, kind):
+        self.filename = filename
+        self.kind = kind
+        self.label, self.id_field, self.parser = get_catalog_kind(kind)[:3]
+        self.catalog = {}
+        self._text = b""    # The file contents the catalog was built from
+        self._starts = []   # Where each block starts in _text, in file order
+        self._ends = []     # Where each block ends in _text
+        self._ids = []      # The record ID each block defines
+        self._signature = None
+        self._lock = threading.Lock()
+        self.reload()
+
+    def check_for_changes(self):
+        """
+        Reload the catalog if the file's size or modification time changed.
+
+        Returns:
+            dict or None: The changes from reload(), or None if nothing changed
+        """
+        try:
+            signature = get_file_signature(self.filename)
+        except OSError:
+            raise MissingDataFileError(self.label.capitalize() + " file not found: " + self.filename)
+        if signature == self._signature:
+            return None
+        return self.reload()
+
+    def reload(self):
+        """
+        Re-read the file, parse only the blocks that changed and publish the result.
+
+        Returns:
+            dict: Lists of "added", "changed" and "removed" IDs
+        """
+        with self._lock:
+            try:
+                signature = get_file_signature(self.filename)
+                with open(self.filename, "rb") as f:
+                    text = f.read()  # Bytes: only the blocks we parse get decoded
+            except FileNotFoundError:
+                raise MissingDataFileError(self.label.capitalize() + " file not found: " + self.filename)
+            except OSError:
+                raise CorruptedDataError("Unable to read " + self.label + " file")
+
+            old_text = self._text
+            starts, ends, ids = self._starts, self._ends, self._ids
+            changes = {"added": [], "changed": [], "removed": []}
+            if text == old_text:
+                self._signature = signature
+                return changes
+
+            # The edit is whatever lies between the unchanged start and end
+            prefix = common_prefix_length(old_text, text)
+            suffix = common_suffix_length(old_text, text, min(len(old_text), len(text)) - prefix)
+            edit_end = len(old_text) - suffix
+            shift = len(text) - len(old_text)
+
+            # Old blocks touching the edit, plus one more on each side
+            first = max(bisect_left(ends, prefix) - 1, 0)
+            last = min(bisect_right(starts, edit_end) + 1, len(starts))
+            if first < last and starts[first] <= prefix:
+                scan_start = starts[first]
+            else:
+                scan_start = 0  # Only blank lines come before the edit
+            if first < last and ends[last - 1] >= edit_end:
+                scan_end = ends[last - 1]
+            else:
+                scan_end = len(old_text)  # Only blank lines come after the edit
+
+            # Blocks whose text did not change keep their record
+            old_catalog = self.catalog
+            reusable = {old_text[starts[i]:ends[i]]: old_catalog[ids[i]] for i in range(first, last)}
+            new_starts = []
+            new_ends = []
+            new_ids = []
+            new_records = []
+            for match in BLOCK_PATTERN.finditer(text, scan_start, scan_end + shift):
+                block_text = match.group()
+                record = reusable.get(block_text)
+                if record is None:
+                    # New or edited block: this is the only place we parse
+                    try:
+                        lines = block_text.decode("utf-8").splitlines()
+                    except UnicodeDecodeError:
+                        raise CorruptedDataError("Unable to read " + self.label + " file")
+                    record = self.parser([line.strip() for line in lines])
+                new_starts.append(match.start())
+                new_ends.append(match.end())
+                new_ids.append(record[self.id_field])
+                new_records.append(record)
+
+            # Patch a copy so the published catalog changes in one step
+            dropped = set(ids[first:last])
+            catalog = old_catalog.copy()
+            for record_id in ids[first:last]:
+                if record_id not in new_ids:
+                    del catalog[record_id]
+                    changes["removed"].append(record_id)
+            seen = set()
+            for record_id, record in zip(new_ids, new_records):
+                if record_id in seen or (record_id in catalog and record_id not in dropped):
+                    raise InvalidDataFormatError("Duplicate " + self.label + " ID: " + record_id)
+                seen.add(record_id)
+                if record_id not in old_catalog:
+                    changes["added"].append(record_id)
+                elif old_catalog[record_id] is not record:
+                    changes["changed"].append(record_id)
+                catalog[record_id] = record
+
+            # Publish everything at once
+            self._starts = starts[:first] + new_starts + [start + shift for start in starts[last:]]
+            self._ends = ends[:first] + new_ends + [end + shift for end in ends[last:]]
+            self._ids = ids[:first] + new_ids + ids[last:]
+            self._text = text
+            self._signature = signature
+            self.catalog = catalog
+            return changes
+
+# Contents are compared a chunk at a time: each slice compare runs in C, so
+# finding where two large texts differ takes milliseconds
+COMPARE_CHUNK = 65536
+
+def common_prefix_length(a, b):
+    """Return how many characters (or bytes) a and b have in common at the start."""
+    limit = min(len(a), len(b))
+    start = 0
+    while start < limit and a[start:start + COMPARE_CHUNK] == b[start:start + COMPARE_CHUNK]:
+        start += COMPARE_CHUNK
+    if start >= limit:
+        return limit
+
+    # The difference is inside this chunk: binary search for it
+    low, high = start, min(start + COMPARE_CHUNK, limit)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[low:middle] == b[low:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+def common_suffix_length(a, b, limit):
+    """Return how many characters (or bytes, at most limit) a and b have in common at the end."""
+    a_end, b_end = len(a), len(b)
+    done = 0
+    while (done < limit and
+           a[max(a_end - done - COMPARE_CHUNK, 0):a_end - done] ==
+           b[max(b_end - done - COMPARE_CHUNK, 0):b_end - done]):
+        done += COMPARE_CHUNK
+    if done >= limit:
+        return limit
+
+    low, high = done, min(done + COMPARE_CHUNK, limit)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[a_end - middle:a_end - low] == b[b_end - middle:b_end - low]:
+            low = middle
         else:
-            block.append(stripped)
+            high = middle - 1
+    return low
+
+# ============================================================================
+# LAZY ITEM CATALOG
+# ============================================================================
+
+# A block is one or more lines that contain something other than spaces
+BLOCK_TEXT_PATTERN = re.compile(r"(?:^[^\S\n]*\S[^\n]*(?:\n|\Z))+", re.M)
+BLOCK_PATTERN = re.compile(rb"(?:^[^\S\n]*\S[^\n]*(?:\n|\Z))+", re.M)
+ITEM_ID_PATTERN = re.compile(rb"^[^\S\n]*ITEM_ID[^\S\n]*:[^\S\n]*([^\n]*?)\s*$", re.M)
 
-    if block:
+class LazyItemCatalog(Mapping):
+    """
+    Read-only item catalog that parses items only when they are looked up.
+
+    The file is memory-mapped and scanned once to build an index of
+    item_id -> (offset, length). Looking up an item parses and validates
+    just that block, and the most recently used items are kept in a small
+    cache. It can be used anywhere the all_items dictionary is used.
+    Invalid blocks raise InvalidDataFormatError when they are looked up.
+    """
+
+    def __init__(self, filename="data/items.txt", cache_size=128):
+        if not os.path.exists(filename):
+            raise MissingDataFileError("Item file not found: " + filename)
+
+        try:
+            self._file = open(filename, "rb")
+            if os.fstat(self._file.fileno()).st_size > 0:
+                self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self._data = b""  # mmap cannot map an empty file
+        except Exception:
+            raise CorruptedDataError("Unable to read item file")
+
+        self.filename = filename
+        self.cache_size = cache_size
+        self._cache = OrderedDict()  # item_id -> parsed item, oldest first
+        self._index = self._build_index()
+
+    def _build_index(self):
+        """Scan the file once and record where each item block is."""
+        index = {}
+        for match in BLOCK_PATTERN.finditer(self._data):
+            start, end = match.span()
+            id_match = ITEM_ID_PATTERN.search(self._data, start, end)
+            if id_match is None:
+                raise InvalidDataFormatError("Item missing field: item_id")
+            item_id = id_match.group(1).decode("utf-8")
+            index[item_id] = (start, end - start)
+        return index
+
+    def __getitem__(self, item_id):
+        cache = self._cache
+        if item_id in cache:
+            cache.move_to_end(item_id)
+            return cache[item_id]
+
+        offset, length = self._index[item_id]  # KeyError if unknown
+        try:
+            text = self._data[offset:offset + length].decode("utf-8")
+        except UnicodeDecodeError:
+            raise CorruptedDataError("Unable to read item file")
+
+        block = [line.strip() for line in text.splitlines() if line.strip()]
         item = parse_item_block(block)
-        validate_item_data(item)
-        items[item["item_id"]] = item
 
-    return items
+        cache[item_id] = item
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)  # Forget the least recently used item
+        return item
+
+    def __contains__(self, item_id):
+        return item_id in self._index
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def close(self):
+        """Release the memory map and file handle."""
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._data = b""
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+# ============================================================================
+# COLUMNAR QUEST TABLE
+# ============================================================================
+
+class QuestTable:
+    """
+    Column-oriented copy of a quest catalog for fast level and reward queries.
+
+    reward_xp, reward_gold and required_level are stored in parallel arrays
+    with an ID -> row index. Rows are also kept sorted by level together with
+    running reward totals, so level range queries use binary search instead
+    of looking at every quest. The table is a snapshot: build a new one if
+    the quest catalog changes.
+    """
+
+    def __init__(self, quest_data_dict):
+        self.quest_ids = list(quest_data_dict)
+        self.row_of = {quest_id: row for row, quest_id in enumerate(self.quest_ids)}
+
+        quests = quest_data_dict.values()
+        self.reward_xp = array("q", [q.get("reward_xp", 0) for q in quests])
+        self.reward_gold = array("q", [q.get("reward_gold", 0) for q in quests])
+        self.required_level = array("q", [q.get("required_level", 1) for q in quests])
+
+        # Rows ordered by required level, plus running totals in that order
+        levels = self.required_level
+        self.rows_by_level = array("q", sorted(range(len(levels)), key=levels.__getitem__))
+        self.sorted_levels = array("q", map(levels.__getitem__, self.rows_by_level))
+        self.xp_running_total = array("q", accumulate(map(self.reward_xp.__getitem__, self.rows_by_level), initial=0))
+        self.gold_running_total = array("q", accumulate(map(self.reward_gold.__getitem__, self.rows_by_level), initial=0))
+
+    def __len__(self):
+        return len(self.quest_ids)
+
+    def level_range_bounds(self, min_level, max_level):
+        """Return (start, end) positions in rows_by_level for a level range."""
+        start = bisect_left(self.sorted_levels, min_level)
+        end = bisect_right(self.sorted_levels, max_level)
+        return start, max(start, end)
+
+    def quest_ids_by_level(self, min_level, max_level):
+        """Return IDs of quests whose required level is in the range, in catalog order."""
+        start, end = self.level_range_bounds(min_level, max_level)
+        rows = sorted(self.rows_by_level[start:end])
+        return list(map(self.quest_ids.__getitem__, rows))
+
+    def quest_ids_unlocked_at_level(self, level):
+        """Return IDs of quests that first become available at exactly this level."""
+        return self.quest_ids_by_level(level, level)
+
+    def count_by_level(self, min_level, max_level):
+        """Return how many quests have a required level in the range."""
+        start, end = self.level_range_bounds(min_level, max_level)
+        return end - start
+
+    def rewards_by_level(self, min_level, max_level):
+        """Return total XP and gold of all quests in a level range."""
+        start, end = self.level_range_bounds(min_level, max_level)
+        return {
+            "total_xp": self.xp_running_total[end] - self.xp_running_total[start],
+            "total_gold": self.gold_running_total[end] - self.gold_running_total[start]
+        }
+
+    def total_rewards(self, quest_ids):
+        """Return total XP and gold for the given quest IDs (unknown IDs count as 0)."""
+        row_of = self.row_of
+        rows = [row_of[quest_id] for quest_id in quest_ids if quest_id in row_of]
+        return {
+            "total_xp": sum(map(self.reward_xp.__getitem__, rows)),
+            "total_gold": sum(map(self.reward_gold.__getitem__, rows))
+        }
 
 # ============================================================================
 # VALIDATION FUNCTIONS
@@ -144,7 +784,7 @@ def validate_item_data(item_dict):
         if key not in item_dict:
             raise InvalidDataFormatError("Item missing field: " + key)
 
-    if item_dict["type"] not in ["weapon", "armor", "consumable"]:
+    if item_dict["type"] not in ITEM_TYPES:
         raise InvalidDataFormatError("Invalid item type: " + item_dict["type"])
 
     if not isinstance(item_dict["cost"], int):
@@ -152,6 +792,90 @@ def validate_item_data(item_dict):
 
     return True
 
+# ============================================================================
+# BULK CATALOG VALIDATION
+# ============================================================================
+
+def validate_catalog_file(filename, kind):
+    """
+    Check a whole quest or item file and report every problem found.
+
+    Unlike load_quests/load_items this does not stop at the first error.
+    The file is read once, one block at a time.
+
+    Args:
+        filename (str): Path to the data file
+        kind (str): "quests" or "items"
+
+    Returns:
+        list: One dict per problem with "file", "line", "block_id" and "message"
+    Raises:
+        MissingDataFileError: If the file does not exist
+        CorruptedDataError: If the file cannot be read
+    """
+    label, id_field, parser = get_catalog_kind(kind)[:3]
+    problems = []
+    first_seen = {}  # record ID -> line where it was first defined
+
+    for numbered_lines in iter_numbered_blocks(filename, label):
+        start_line = numbered_lines[0][0]
+        block_problems = []
+        record = parser([line for line_number, line in numbered_lines], block_problems)
+        block_problems = [(numbered_lines[index][0], message) for index, message in block_problems]
+        block_id = record.get(id_field)
+
+        if block_id is not None:
+            if block_id in first_seen:
+                block_problems.append((start_line, "Duplicate " + label + " ID: " + block_id +
+                                       " (first defined on line " + str(first_seen[block_id]) + ")"))
+            else:
+                first_seen[block_id] = start_line
+
+        for line_number, message in block_problems:
+            problems.append({
+                "file": filename,
+                "line": line_number,
+                "block_id": block_id,
+                "message": message
+            })
+    return problems
+
+def iter_numbered_blocks(filename, label):
+    """
+    Like iter_blocks, but each block is a list of (line number, line) pairs.
+    """
+    if not os.path.exists(filename):
+        raise MissingDataFileError(label.capitalize() + " file not found: " + filename)
+
+    try:
+        f = open(filename, "r")
+    except Exception:
+        raise CorruptedDataError("Unable to read " + label + " file")
+
+    with f:
+        block = []
+        try:
+            for line_number, line in enumerate(f, 1):
+                stripped = line.strip()
+                if stripped == "":
+                    if block:
+                        yield block
+                        block = []
+                else:
+                    block.append((line_number, stripped))
+        except (OSError, UnicodeDecodeError):
+            raise CorruptedDataError("Unable to read " + label + " file")
+
+        if block:
+            yield block
+
+def format_problem(problem):
+    """Turn a problem from validate_catalog_file into one readable line."""
+    text = problem["file"] + ":" + str(problem["line"]) + ": "
+    if problem["block_id"] is not None:
+        text += "[" + problem["block_id"] + "] "
+    return text + problem["message"]
+
 # ============================================================================
 # DEFAULT DATA FILE CREATION
 # ============================================================================
@@ -197,89 +921,316 @@ def create_default_data_files():
         except Exception:
             raise CorruptedDataError("Could not write items.txt")
 
+# ============================================================================
+# RECORD TYPES
+# ============================================================================
+
+class Record(Mapping):
+    """
+    Base class for compact quest and item records.
+
+    Records store their fields in __slots__ instead of a per-record
+    dictionary, which saves a lot of memory in large catalogs. They still
+    act like dictionaries, so code such as quest["reward_xp"] and
+    item.get("name") keeps working.
+    """
+    __slots__ = ()
+    defaults = {}  # Values for optional fields that were left out
+
+    # Subclasses take their fields positionally, in __slots__ order, which
+    # is what parse_block builds. from_dict is the slower, friendlier way.
+
+    @classmethod
+    def from_dict(cls, values):
+        """Build a record from a dictionary, filling in defaults for missing keys."""
+        defaults = cls.defaults
+        return cls(*[values.get(name, defaults.get(name)) for name in cls.__slots__])
+
+    def __getitem__(self, key):
+        if key in self.__slots__:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def get(self, key, default=None):
+        # Faster than Mapping.get, which goes through __getitem__ and KeyError
+        if key in self.__slots__:
+            return getattr(self, key)
+        return default
+
+    def __contains__(self, key):
+        return key in self.__slots__
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self):
+        return len(self.__slots__)
+
+    def __repr__(self):
+        return type(self).__name__ + "(" + repr(dict(self)) + ")"
+
+    def as_tuple(self):
+        """Return the record's values in __slots__ order (what __init__ takes)."""
+        return tuple([getattr(self, name) for name in self.__slots__])
+
+    def __reduce__(self):
+        # Pickle as "call the class with these values". Without this, pickle
+        # builds a dictionary of slot values for every record, which made
+        # the catalog cache and parallel loading as slow as parsing.
+        return type(self), self.as_tuple()
+
+class Quest(Record):
+    """One quest loaded from the quests file."""
+    __slots__ = ("quest_id", "title", "description", "reward_xp",
+                 "reward_gold", "required_level", "prerequisite", "objectives")
+    defaults = {"objectives": ()}
+
+    def __init__(self, quest_id, title, description, reward_xp,
+                 reward_gold, required_level, prerequisite, objectives=()):
+        self.quest_id = quest_id
+        self.title = title
+        self.description = description
+        self.reward_xp = reward_xp
+        self.reward_gold = reward_gold
+        self.required_level = required_level
+        self.prerequisite = prerequisite
+        self.objectives = objectives
+
+class Item(Record):
+    """One item loaded from the items file."""
+    __slots__ = ("item_id", "name", "type", "effect", "cost", "description")
+
+    def __init__(self, item_id, name, type, effect, cost, description):
+        self.item_id = item_id
+        self.name = name
+        self.type = type
+        self.effect = effect
+        self.cost = cost
+        self.description = description
+
 # ============================================================================
 # PARSING HELPER FUNCTIONS
 # ============================================================================
 
-def parse_quest_block(lines):
+def parse_effect_string(effect_string):
     """
-    Convert a list of lines from the quest file into a dictionary.
+    Split an effect string like "health:20" into ("health", 20).
+
+    Raises:
+        InvalidDataFormatError: If the effect is not "stat:number"
     """
-    quest = {}
-    for line in lines:
-        if ":" not in line:
-            raise InvalidDataFormatError("Invalid quest line: " + line)
+    stat, colon, value = effect_string.partition(":")
+    stat = stat.strip()
+    if not colon or not stat:
+        raise InvalidDataFormatError("Invalid effect: " + effect_string)
+    try:
+        return stat, int(value)
+    except ValueError:
+        raise InvalidDataFormatError("Invalid effect: " + effect_string)
 
-        key, value = line.split(":", 1)
-        key = key.strip()
-        value = value.strip()
+class ItemEffect(tuple):
+    """
+    A compiled item effect: an immutable tuple of (stat, value) pairs.
 
-        # Map file keys to dictionary keys
-        if key == "QUEST_ID":
-            quest["quest_id"] = value
-        elif key == "TITLE":
-            quest["title"] = value
-        elif key == "DESCRIPTION":
-            quest["description"] = value
-        elif key == "REWARD_XP":
-            try:
-                quest["reward_xp"] = int(value)
-            except:
-                raise InvalidDataFormatError("REWARD_XP must be a number")
-        elif key == "REWARD_GOLD":
-            try:
-                quest["reward_gold"] = int(value)
-            except:
-                raise InvalidDataFormatError("REWARD_GOLD must be a number")
-        elif key == "REQUIRED_LEVEL":
-            try:
-                quest["required_level"] = int(value)
-            except:
-                raise InvalidDataFormatError("REQUIRED_LEVEL must be a number")
-        elif key == "PREREQUISITE":
-            quest["prerequisite"] = value
-        else:
-            raise InvalidDataFormatError("Unknown quest field: " + key)
+    Items get their effect compiled once when they are loaded, so using or
+    equipping an item never has to parse text. str() gives back the
+    original "stat:value" form.
+    """
+    __slots__ = ()
+
+    def __new__(cls, stats):
+        return tuple.__new__(cls, ((sys.intern(stat), value) for stat, value in stats))
+
+    def __str__(self):
+        return ",".join(stat + ":" + str(value) for stat, value in self)
+
+    def __repr__(self):
+        return "ItemEffect(" + repr(str(self)) + ")"
+
+def compile_effect(effect_string):
+    """
+    Turn an effect string like "health:20" or "health:20,strength:5" into
+    an ItemEffect.
+
+    Raises:
+        InvalidDataFormatError: If any part is not "stat:number"
+    """
+    return ItemEffect([parse_effect_string(part) for part in effect_string.split(",")])
 
-    return quest
+# Things a quest objective can count
+OBJECTIVE_EVENTS = ("kill", "buy")
 
-def parse_item_block(lines):
+def compile_objectives(objective_string):
     """
-    Convert a list of lines from the items file into a dictionary.
+    Turn an OBJECTIVE value into a tuple of (event, targets, count) tuples.
+
+    The value is a comma-separated list like "kill:goblin:3,buy:weapon|armor:1".
+    targets is a tuple of the names separated by "|"; "any" matches anything.
+
+    Raises:
+        InvalidDataFormatError: If an objective is not "event:target:count"
+    """
+    objectives = []
+    for part in objective_string.split(","):
+        pieces = [piece.strip() for piece in part.split(":")]
+        if len(pieces) != 3 or pieces[0] not in OBJECTIVE_EVENTS or not pieces[1]:
+            raise InvalidDataFormatError("Invalid objective: " + part.strip())
+        try:
+            count = int(pieces[2])
+        except ValueError:
+            raise InvalidDataFormatError("Invalid objective: " + part.strip())
+        if count < 1:
+            raise InvalidDataFormatError("Invalid objective: " + part.strip())
+        targets = tuple(sys.intern(target.strip()) for target in pieces[1].split("|"))
+        objectives.append((sys.intern(pieces[0]), targets, count))
+    return tuple(objectives)
+
+# Each schema entry is (file key, dictionary key, converter, required).
+# A converter of None keeps the text as it is.
+
+def convert_item_type(value):
+    """Make sure an item TYPE is one the game understands."""
+    if value not in ITEM_TYPES:
+        raise InvalidDataFormatError("Invalid item type: " + value)
+    return sys.intern(value)
+
+ITEM_TYPES = ("weapon", "armor", "consumable")
+
+QUEST_SCHEMA = [
+    ("QUEST_ID", "quest_id", None, True),
+    ("TITLE", "title", None, True),
+    ("DESCRIPTION", "description", None, True),
+    ("REWARD_XP", "reward_xp", int, True),
+    ("REWARD_GOLD", "reward_gold", int, True),
+    ("REQUIRED_LEVEL", "required_level", int, True),
+    ("PREREQUISITE", "prerequisite", None, True),
+    ("OBJECTIVE", "objectives", compile_objectives, False)  # "kill:goblin:3"
+]
+
+ITEM_SCHEMA = [
+    ("ITEM_ID", "item_id", sys.intern, True),
+    ("NAME", "name", None, True),
+    ("TYPE", "type", convert_item_type, True),
+    ("EFFECT", "effect", compile_effect, True),  # "health:20" -> ItemEffect
+    ("COST", "cost", int, True),
+    ("DESCRIPTION", "description", None, True)
+]
+
+def compile_schema(schema, record_type):
+    """
+    Turn a schema list into a lookup table used by parse_block.
+
+    Returns:
+        tuple: (dict of file key -> (dict key, converter, slot position),
+                list of (slot position, dict key) for required fields,
+                record class to build,
+                starting values in slot order: defaults for optional
+                fields and _MISSING for required ones)
+    """
+    fields = {}
+    required = []
+    template = [record_type.defaults.get(name) for name in record_type.__slots__]
+    for file_key, dict_key, converter, is_required in schema:
+        position = record_type.__slots__.index(dict_key)
+        fields[file_key] = (dict_key, converter, position)
+        if is_required:
+            required.append((position, dict_key))
+            template[position] = _MISSING
+    return fields, required, record_type, template
+
+_MISSING = object()  # Marks fields a block has not set yet
+
+QUEST_FIELDS = compile_schema(QUEST_SCHEMA, Quest)
+ITEM_FIELDS = compile_schema(ITEM_SCHEMA, Item)
+
+def parse_block(lines, compiled_schema, label, problems=None):
     """
-    item = {}
-    for line in lines:
-        if ":" not in line:
-            raise InvalidDataFormatError("Invalid item line: " + line)
+    Convert and validate the lines of one block in a single pass.
+
+    Args:
+        lines (list): Stripped, non-blank lines of the block
+        compiled_schema (tuple): Result of compile_schema
+        label (str): "quest" or "item", used in error messages
+        problems (list): If given, problems are added to it as
+            (index in lines, message) instead of raised, and bad or
+            missing fields are left as None
+
+    Returns:
+        Quest or Item: The parsed record
+    Raises:
+        InvalidDataFormatError: If a line, field or value is invalid
+            (only when problems is not given)
+    """
+    fields, required, record_type, template = compiled_schema
+    values = template[:]  # In slot order
+    for index, line in enumerate(lines):
+        key, colon, value = line.partition(":")
+        if not colon:
+            report_block_problem(problems, index, "Invalid " + label + " line: " + line)
+            continue
 
-        key, value = line.split(":", 1)
         key = key.strip()
-        value = value.strip()
+        try:
+            dict_key, converter, position = fields[key]
+        except KeyError:
+            report_block_problem(problems, index, "Unknown " + label + " field: " + key)
+            continue
 
-        if key == "ITEM_ID":
-            item["item_id"] = value
-        elif key == "NAME":
-            item["name"] = value
-        elif key == "TYPE":
-            item["type"] = value
-        elif key == "EFFECT":
-            item["effect"] = value  # Store effect as raw string like "health:20"
-        elif key == "COST":
+        value = value.strip()
+        if converter is not None:
             try:
-                item["cost"] = int(value)
-            except:
-                raise InvalidDataFormatError("COST must be a number")
-        elif key == "DESCRIPTION":
-            item["description"] = value
-        else:
-            raise InvalidDataFormatError("Unknown item field: " + key)
+                value = converter(value)
+            except ValueError:
+                report_block_problem(problems, index, key + " must be a number")
+                value = None  # The field is there, so don't also call it missing
+            except InvalidDataFormatError as e:
+                report_block_problem(problems, index, str(e))
+                value = None
+        values[position] = value
 
-    return item
+    # Only look for the missing field when one is still unset
+    if _MISSING in values:
+        for position, dict_key in required:
+            if values[position] is _MISSING:
+                report_block_problem(problems, 0, label.capitalize() + " missing field: " + dict_key)
+                values[position] = None
+    return record_type(*values)
+
+def report_block_problem(problems, index, message):
+    """Raise a block problem, or add it to problems when collecting them."""
+    if problems is None:
+        raise InvalidDataFormatError(message)
+    problems.append((index, message))
+
+def parse_quest_block(lines, problems=None):
+    """
+    Convert a list of lines from the quest file into a validated Quest.
+    """
+    return parse_block(lines, QUEST_FIELDS, "quest", problems)
+
+def parse_item_block(lines, problems=None):
+    """
+    Convert a list of lines from the items file into a validated Item.
+    """
+    return parse_block(lines, ITEM_FIELDS, "item", problems)
 
 # ============================================================================
 # TESTING
 # ============================================================================
 
+if __name__ == "__main__" and len(sys.argv) == 4 and sys.argv[1] == "validate":
+    # Usage: python game_data.py validate <file> <quests|items>
+    # Exits with status 1 if any problems are found (for pre-commit hooks)
+    found = validate_catalog_file(sys.argv[2], sys.argv[3])
+    for problem in found:
+        print(format_problem(problem))
+    sys.exit(1 if found else 0)
+
 if __name__ == "__main__":
     print("=== GAME DATA MODULE TEST ===")
     
@@ -11,7 +11,9 @@ I have reviewed and studied the project to ensure understanding.
 This module handles inventory management, item usage, and equipment.
 """
 
+import game_data
 from custom_exceptions import (
+    InvalidDataFormatError,   # Raised by game_data for a bad effect string
     InventoryFullError,      #Raised if trying to add to a full inventory
     ItemNotFoundError,       # Raised if an item is not in inventory
     InsufficientResourcesError,# Raised if character cannot afford an item
@@ -100,13 +102,14 @@ def use_item(character, item_id, item_data):
         raise InvalidItemTypeError("Item is not consumable: " + item_id)
 
     # Apply the item's effect to the character
-    stat_name, value = parse_item_effect(item_data["effect"])
-    apply_stat_effect(character, stat_name, value)
+    effect = get_item_effect(item_data)
+    apply_item_effect(character, effect)
 
     # Remove item from inventory after use
     character["inventory"].remove(item_id)
     item_name = item_data.get("name", item_id)
-    return f"Used {item_name} (+{value} {stat_name})"
+    gains = ", ".join(f"+{value} {stat_name}" for stat_name, value in effect)
+    return f"Used {item_name} ({gains})"
 
 
 def equip_weapon(character, item_id, item_data):
@@ -130,8 +133,7 @@ def equip_weapon(character, item_id, item_data):
     if character.get("equipped_weapon"):
         old_id = character["equipped_weapon"]
         old_data = character["equipped_weapon_data"]
-        stat, val = parse_item_effect(old_data["effect"])
-        apply_stat_effect(character, stat, -val)  # Remove old weapon effect
+        apply_item_effect(character, get_item_effect(old_data), -1)  # Remove old weapon effect
 
         # Make sure there is space to return old weapon
         if len(character["inventory"]) >= MAX_INVENTORY_SIZE:
@@ -141,8 +143,7 @@ def equip_weapon(character, item_id, item_data):
         character["inventory"].append(old_id)
 
     # Equip new weapon and apply its effect
-    stat, val = parse_item_effect(item_data["effect"])
-    apply_stat_effect(character, stat, val)
+    apply_item_effect(character, get_item_effect(item_data))
     character["equipped_weapon"] = item_id
     character["equipped_weapon_data"] = item_data
     character["inventory"].remove(item_id)
@@ -172,8 +173,7 @@ def equip_armor(character, item_id, item_data):
     if character.get("equipped_armor"):
         old_id = character["equipped_armor"]
         old_data = character["equipped_armor_data"]
-        stat, val = parse_item_effect(old_data["effect"])
-        apply_stat_effect(character, stat, -val)  # Remove old armor effect
+        apply_item_effect(character, get_item_effect(old_data), -1)  # Remove old armor effect
 
         # Make sure there is space to return old armor
         if len(character["inventory"]) >= MAX_INVENTORY_SIZE:
@@ -183,8 +183,7 @@ def equip_armor(character, item_id, item_data):
         character["inventory"].append(old_id)
 
     # Equip new armor and apply its effect
-    stat, val = parse_item_effect(item_data["effect"])
-    apply_stat_effect(character, stat, val)
+    apply_item_effect(character, get_item_effect(item_data))
     character["equipped_armor"] = item_id
     character["equipped_armor_data"] = item_data
     character["inventory"].remove(item_id)
@@ -210,8 +209,7 @@ def unequip_weapon(character):
     # Remove weapon effect
     weapon_id = character["equipped_weapon"]
     weapon_data = character["equipped_weapon_data"]
-    stat, val = parse_item_effect(weapon_data["effect"])
-    apply_stat_effect(character, stat, -val)
+    apply_item_effect(character, get_item_effect(weapon_data), -1)
 
     # Return weapon to inventory
     character["inventory"].append(weapon_id)
@@ -238,8 +236,7 @@ def unequip_armor(character):
     # Remove armor effect
     armor_id = character["equipped_armor"]
     armor_data = character["equipped_armor_data"]
-    stat, val = parse_item_effect(armor_data["effect"])
-    apply_stat_effect(character, stat, -val)
+    apply_item_effect(character, get_item_effect(armor_data), -1)
 
     # Return armor to inventory
     character["inventory"].append(armor_id)
@@ -313,6 +310,35 @@ def parse_item_effect(effect_string):
     return stat, value
 
 
+def get_item_effect(item_data):
+    """
+    Return the compiled ItemEffect for an item.
+
+    Items loaded by game_data already hold an ItemEffect, so this is just a
+    lookup. Item dictionaries built by hand with a string like "health:20"
+    are compiled here.
+
+    Raises:
+        InvalidItemTypeError: if the effect string is malformed.
+    """
+    effect = item_data["effect"]
+    if isinstance(effect, game_data.ItemEffect):
+        return effect
+    try:
+        return game_data.compile_effect(effect)
+    except InvalidDataFormatError:
+        raise InvalidItemTypeError("Invalid effect format")
+
+
+def apply_item_effect(character, effect, direction=1):
+    """
+    Apply every stat change in an ItemEffect to a character.
+    Use direction=-1 to take the effect back off (when unequipping).
+    """
+    for stat_name, value in effect:
+        apply_stat_effect(character, stat_name, value * direction)
+
+
 def apply_stat_effect(character, stat_name, value):
     """
     Apply an effect to a character's stat (e.g., health, strength).
@@ -27,6 +27,7 @@ from custom_exceptions import *
 # Global variables for game data
 current_character = None
 all_quests = {}
+quest_graph = None  # Prerequisite graph for all_quests, rebuilt whenever they are loaded
 all_items = {}
 game_running = False
 
@@ -84,6 +85,8 @@ def new_game():
     # Try to create the character
     try:
         current_character = character_manager.create_character(name, character_class)
+        quest_handler.attach_quest_tracker(current_character, all_quests, quest_graph)
+        quest_handler.attach_objective_tracker(current_character, all_quests)
         print("\nCharacter created successfully!\n")
         game_loop()  # Start the game loop
     except InvalidCharacterClassError:
@@ -108,7 +111,7 @@ def load_game():
     print("\nSaved characters:")
     index = 1
     for s in saves:
-        print(str(index) + ". " + s)
+        print(str(index) + ". " + s["name"] + " - Level " + str(s["level"]) + " " + s["class"])
         index += 1
 
     # Ask player to choose a save
@@ -119,15 +122,27 @@ def load_game():
         choice = input("Invalid. Choose again: ")
 
     # Load the selected character
-    name = saves[int(choice) - 1]
+    name = saves[int(choice) - 1]["name"]
     try:
         current_character = character_manager.load_character(name)
+        quest_handler.attach_quest_tracker(current_character, all_quests, quest_graph)
+        quest_handler.attach_objective_tracker(current_character, all_quests)
         print("\nGame loaded!\n")
         game_loop()  # Start the game loop
     except CharacterNotFoundError:
         print("Save not found.")
+        repair_save_list()
     except SaveFileCorruptedError:
         print("Save file corrupted.")
+        repair_save_list()
+
+
+def repair_save_list():
+    """Rescan the save folder after a listed save could not be loaded"""
+    # The save list only notices changes to the top save folder, so a save
+    # deleted or broken inside a shard folder stays listed until a rescan
+    character_manager.list_saved_characters(repair=True)
+    print("The list of saved games has been refreshed.")
 
 
 # ============================================================================ 
@@ -300,17 +315,22 @@ def explore():
     print("\nYou venture into the wilderness...")
 
     # Generate an enemy based on player's level
-    enemy = combat_system.generate_enemy(current_character["level"])
+    enemy = combat_system.get_random_enemy_for_level(current_character["level"])
     print("A wild " + enemy["name"] + " appears!")
 
     # Start a battle
     battle = combat_system.SimpleBattle(current_character, enemy)
-    result = battle.start()
+    result = battle.start_battle()
 
     print(result)
 
+    # Count the kill towards quest objectives
+    if result["winner"] == "player":
+        finished = quest_handler.record_quest_event(current_character, "kill", enemy["name"].lower())
+        complete_finished_quests(finished)
+
     # Check if character died
-    if result == "defeat":
+    if current_character["health"] <= 0:
         handle_character_death()
 
 
@@ -343,6 +363,9 @@ def shop():
             try:
                 inventory_system.purchase_item(current_character, item_id, all_items[item_id])
                 print("Purchased " + all_items[item_id]["name"])
+                finished = quest_handler.record_quest_event(
+                    current_character, "buy", [item_id, all_items[item_id]["type"]])
+                complete_finished_quests(finished)
             except Exception as e:
                 print("Error:", e)
         else:
@@ -362,6 +385,18 @@ def shop():
 # HELPER FUNCTIONS
 # ============================================================================
 
+def complete_finished_quests(quest_ids):
+    """Turn in quests whose objectives were just finished"""
+    global current_character
+
+    for quest_id in quest_ids:
+        try:
+            rewards = quest_handler.complete_quest(current_character, quest_id, all_quests)
+            print("Quest complete: " + all_quests[quest_id]["title"] + " " + str(rewards))
+        except Exception as e:
+            print("Error:", e)
+
+
 def save_game():
     """Save the current character's progress"""
     global current_character
@@ -375,16 +410,26 @@ def save_game():
 
 def load_game_data():
     """Load all game quests and items"""
-    global all_quests, all_items
+    global all_quests, all_items, quest_graph
 
     try:
-        all_quests = game_data.load_quests()
-        all_items = game_data.load_items()
+        all_quests = game_data.load_quests(use_cache=True)
+        all_items = game_data.load_items(use_cache=True)
     except MissingDataFileError:
         raise
     except InvalidDataFormatError:
         raise
 
+    # Build the graph once here, so it always matches the loaded quests
+    quest_graph = quest_handler.QuestGraph(all_quests)
+
+    # Broken prerequisite links would make quests impossible or hang chains
+    report = quest_handler.validate_quest_graph(all_quests, quest_graph)
+    if report['dangling'] or report['cycles']:
+        raise InvalidDataFormatError("; ".join(quest_handler.format_quest_graph_problems(report)))
+    for warning in quest_handler.format_quest_graph_problems(report):
+        print("Warning:", warning)
+
 
 def handle_character_death():
     """Handle what happens when the character dies"""
@@ -11,6 +11,15 @@ I have reviewed and studied the project to ensure understanding.
 This module handles quest management, dependencies, and completion.
 """
 
+import heapq  # Priority queue used by the route planner
+import queue  # Hands events to background subscribers
+import shutil  # Terminal size for quest tables
+import sys
+import threading
+import time
+from collections import OrderedDict, deque, namedtuple
+
+import character_manager
 from custom_exceptions import (
     QuestNotFoundError,
     QuestRequirementsNotMetError,
@@ -19,53 +28,124 @@ from custom_exceptions import (
     InsufficientLevelError
 )
 
+# Result codes used by the check functions and apply_quest_actions
+QUEST_OK = "ok"
+QUEST_NOT_FOUND = "quest_not_found"
+LEVEL_TOO_LOW = "level_too_low"
+PREREQUISITE_NOT_MET = "prerequisite_not_met"
+ALREADY_COMPLETED = "already_completed"
+ALREADY_ACTIVE = "already_active"
+NOT_ACTIVE = "not_active"
+UNKNOWN_ACTION = "unknown_action"
+
+# Kinds of events sent by quest_events
+QUEST_ACCEPTED = "quest_accepted"
+QUEST_COMPLETED = "quest_completed"
+QUEST_ABANDONED = "quest_abandoned"
+QUEST_EVENT_KINDS = (QUEST_ACCEPTED, QUEST_COMPLETED, QUEST_ABANDONED)
+
 # ============================================================================
 # QUEST MANAGEMENT
 # ============================================================================
 
 def accept_quest(character, quest_id, quest_data_dict):
     """Accept a new quest with all validations."""
+    quest = quest_data_dict.get(quest_id)
+    result = check_accept_quest(character, quest_id, quest)
 
-    # Check if the quest exists in the data
-    if quest_id not in quest_data_dict:
+    if result == QUEST_NOT_FOUND:
         raise QuestNotFoundError(f"Quest {quest_id} not found")
-
-    quest = quest_data_dict[quest_id]
-
-    # Check if character meets the level requirement
-    if character.get('level', 1) < quest.get('required_level', 1):
+    if result == LEVEL_TOO_LOW:
         raise InsufficientLevelError(f"Level too low for quest {quest_id}")
-
-    # Check if there is a prerequisite quest
-    prereq = quest.get('prerequisite', 'NONE')
-    if prereq != 'NONE' and prereq not in character.get('completed_quests', []):
-        raise QuestRequirementsNotMetError(f"Prerequisite {prereq} not completed")
-
-    # Check if the quest is already completed
-    if quest_id in character.get('completed_quests', []):
+    if result == PREREQUISITE_NOT_MET:
+        raise QuestRequirementsNotMetError(f"Prerequisite {quest.get('prerequisite')} not completed")
+    if result == ALREADY_COMPLETED:
         raise QuestAlreadyCompletedError(f"Quest {quest_id} already completed")
-
-    # Check if the quest is already active
-    if quest_id in character.get('active_quests', []):
+    if result == ALREADY_ACTIVE:
         raise QuestAlreadyCompletedError(f"Quest {quest_id} is already active")
 
-    # Add the quest to the character's active quests
-    character.setdefault('active_quests', []).append(quest_id)
+    start_quest(character, quest_id)
     return True
 
 
 def complete_quest(character, quest_id, quest_data_dict):
     """Complete an active quest and grant rewards."""
+    quest = quest_data_dict.get(quest_id)
+    result = check_complete_quest(character, quest_id, quest)
 
-    # Check if the quest exists
-    if quest_id not in quest_data_dict:
+    if result == QUEST_NOT_FOUND:
         raise QuestNotFoundError(f"Quest {quest_id} not found")
+    if result == NOT_ACTIVE:
+        raise QuestNotActiveError(f"Quest {quest_id} is not active")
 
-    # Check if the quest is currently active
+    # Return rewards for reference
+    return finish_quest(character, quest_id, quest)
+
+
+def abandon_quest(character, quest_id):
+    """Remove a quest from active quests without completing it."""
+
+    # Make sure the quest is active
     if quest_id not in character.get('active_quests', []):
         raise QuestNotActiveError(f"Quest {quest_id} is not active")
 
-    quest = quest_data_dict[quest_id]
+    drop_quest(character, quest_id)
+    return True
+
+
+def check_accept_quest(character, quest_id, quest):
+    """
+    Return QUEST_OK if the quest can be accepted, otherwise a result code
+    saying why not. quest is the quest's data, or None if it doesn't exist.
+    """
+    # Check if the quest exists in the data
+    if quest is None:
+        return QUEST_NOT_FOUND
+
+    # Check if character meets the level requirement
+    if character.get('level', 1) < quest.get('required_level', 1):
+        return LEVEL_TOO_LOW
+
+    # Check if there is a prerequisite quest
+    completed = character.get('completed_quests', [])
+    prereq = quest.get('prerequisite', 'NONE')
+    if prereq != 'NONE' and prereq not in completed:
+        return PREREQUISITE_NOT_MET
+
+    # Check if the quest is already completed or active
+    if quest_id in completed:
+        return ALREADY_COMPLETED
+    if quest_id in character.get('active_quests', []):
+        return ALREADY_ACTIVE
+
+    return QUEST_OK
+
+
+def check_complete_quest(character, quest_id, quest):
+    """Return QUEST_OK if the quest can be completed, otherwise a result code."""
+    if quest is None:
+        return QUEST_NOT_FOUND
+    if quest_id not in character.get('active_quests', []):
+        return NOT_ACTIVE
+    return QUEST_OK
+
+
+def start_quest(character, quest_id):
+    """Add an already-checked quest to the character's active quests."""
+    character.setdefault('active_quests', []).append(quest_id)
+
+    tracker = character.get('quest_tracker')
+    if tracker is not None:
+        tracker.quest_accepted(quest_id)
+    objectives = character.get('objective_tracker')
+    if objectives is not None:
+        objectives.watch(quest_id)
+
+    quest_events.emit(QUEST_ACCEPTED, character, quest_id)
+
+
+def finish_quest(character, quest_id, quest):
+    """Move an already-checked quest to completed and grant its rewards."""
 
     # Move quest from active to completed
     character['active_quests'].remove(quest_id)
@@ -77,20 +157,88 @@ def complete_quest(character, quest_id, quest_data_dict):
     character['experience'] = character.get('experience', 0) + xp
     character['gold'] = character.get('gold', 0) + gold
 
-    # Return rewards for reference
-    return {'xp': xp, 'gold': gold}
+    # Keep running totals so stats screens don't have to recount
+    if 'quest_xp_earned' in character:
+        character['quest_xp_earned'] += xp
+    if 'quest_gold_earned' in character:
+        character['quest_gold_earned'] += gold
 
+    tracker = character.get('quest_tracker')
+    if tracker is not None:
+        tracker.quest_completed(quest_id)
+    objectives = character.get('objective_tracker')
+    if objectives is not None:
+        objectives.unwatch(quest_id)
 
-def abandon_quest(character, quest_id):
-    """Remove a quest from active quests without completing it."""
+    rewards = {'xp': xp, 'gold': gold}
+    quest_events.emit(QUEST_COMPLETED, character, quest_id, rewards)
+    return rewards
 
-    # Make sure the quest is active
-    if quest_id not in character.get('active_quests', []):
-        raise QuestNotActiveError(f"Quest {quest_id} is not active")
 
-    # Remove it from active quests
+def drop_quest(character, quest_id):
+    """Remove an already-checked quest from the character's active quests."""
     character['active_quests'].remove(quest_id)
-    return True
+
+    tracker = character.get('quest_tracker')
+    if tracker is not None:
+        tracker.quest_abandoned(quest_id)
+    objectives = character.get('objective_tracker')
+    if objectives is not None:
+        objectives.unwatch(quest_id)  # Progress starts over if taken again
+
+    quest_events.emit(QUEST_ABANDONED, character, quest_id)
+
+
+def apply_quest_actions(batch, quest_data_dict):
+    """
+    Apply many quest actions, possibly for many characters, in one call.
+
+    Failed actions are reported with a result code instead of raising an
+    exception, so a failure costs about the same as a success.
+
+    Args:
+        batch (iterable): (character, action, quest_id) tuples, where action
+            is "accept", "complete" or "abandon"
+        quest_data_dict (dict): All quests
+
+    Returns:
+        dict: "results" - one result code per action, in order;
+              "rewards" - list of (character, {'xp': total, 'gold': total})
+              pairs for the XP and gold earned from quests completed in
+              this batch, one pair per character in the order they were
+              first rewarded
+    """
+    get_quest = quest_data_dict.get
+    results = []
+    rewards = {}  # id(character) -> (character, totals); names may repeat
+
+    for character, action, quest_id in batch:
+        quest = get_quest(quest_id)
+        if action == "accept":
+            result = check_accept_quest(character, quest_id, quest)
+            if result == QUEST_OK:
+                start_quest(character, quest_id)
+        elif action == "complete":
+            result = check_complete_quest(character, quest_id, quest)
+            if result == QUEST_OK:
+                gained = finish_quest(character, quest_id, quest)
+                entry = rewards.get(id(character))
+                if entry is None:
+                    entry = rewards[id(character)] = (character, {'xp': 0, 'gold': 0})
+                totals = entry[1]
+                totals['xp'] += gained['xp']
+                totals['gold'] += gained['gold']
+        elif action == "abandon":
+            if quest_id in character.get('active_quests', []):
+                drop_quest(character, quest_id)
+                result = QUEST_OK
+            else:
+                result = NOT_ACTIVE
+        else:
+            result = UNKNOWN_ACTION
+        results.append(result)
+
+    return {'results': results, 'rewards': list(rewards.values())}
 
 
 def get_active_quests(character, quest_data_dict):
@@ -106,6 +254,11 @@ def get_completed_quests(character, quest_data_dict):
 
 def get_available_quests(character, quest_data_dict):
     """Return quests that can currently be accepted."""
+    # Use the character's tracker if it follows this quest data
+    tracker = character.get('quest_tracker')
+    if tracker is not None and tracker.quest_data_dict is quest_data_dict:
+        return tracker.get_available_quests()
+
     available = []
     for qid, quest in quest_data_dict.items():
         # Only include quests that meet requirements
@@ -130,52 +283,713 @@ def is_quest_active(character, quest_id):
 
 def can_accept_quest(character, quest_id, quest_data_dict):
     """Check if quest requirements are met (returns boolean)."""
+    return check_accept_quest(character, quest_id, quest_data_dict.get(quest_id)) == QUEST_OK
 
-    # Quest must exist
-    if quest_id not in quest_data_dict:
-        return False
 
-    quest = quest_data_dict[quest_id]
+def get_quest_prerequisite_chain(quest_id, quest_data_dict, graph=None):
+    """
+    Return full prerequisite chain in order.
 
-    # Must meet level requirement
-    if character.get('level', 1) < quest.get('required_level', 1):
-        return False
-
-    # Must meet prerequisite quest requirement
-    prereq = quest.get('prerequisite', 'NONE')
-    if prereq != 'NONE' and prereq not in character.get('completed_quests', []):
-        return False
-
-    # Quest cannot already be completed
-    if quest_id in character.get('completed_quests', []):
-        return False
-
-    # Quest cannot already be active
-    if quest_id in character.get('active_quests', []):
-        return False
-
-    return True
-
-
-def get_quest_prerequisite_chain(quest_id, quest_data_dict):
-    """Return full prerequisite chain in order."""
+    With a QuestGraph the chain comes from the graph (and is remembered
+    there); otherwise the prerequisite links are followed in the quest
+    data itself, so edits to the data are always seen.
+    """
+    if graph is not None:
+        return list(graph.chain(quest_id))
 
     # Check if the quest exists
     if quest_id not in quest_data_dict:
         raise QuestNotFoundError(f"Quest {quest_id} not found")
 
+    # Walk backwards through prerequisites, then flip the list once
     chain = []
     current = quest_id
-
-    # Walk backwards through prerequisites
     while current != 'NONE':
-        chain.insert(0, current)  # Insert at beginning to maintain order
-        current = quest_data_dict.get(current, {}).get('prerequisite', 'NONE')
+        chain.append(current)
+        if len(chain) > len(quest_data_dict):
+            raise QuestRequirementsNotMetError(f"Quest {quest_id} has a circular prerequisite chain")
+        current = quest_data_dict[current].get('prerequisite', 'NONE')
         if current != 'NONE' and current not in quest_data_dict:
             raise QuestNotFoundError(f"Prerequisite {current} does not exist")
+    chain.reverse()
     return chain
 
 
+# ============================================================================
+# QUEST GRAPH
+# ============================================================================
+
+CHAIN_CACHE_SIZE = 64  # Prerequisite chains each QuestGraph remembers
+
+
+class QuestGraph:
+    """
+    Prerequisite links between quests, built once from the quest data.
+
+    Every quest has at most one prerequisite, so the quests form a forest.
+    The graph stores the parent and children of every quest, a topological
+    order (prerequisites always come before the quests that need them) and
+    the depth of each quest in its chain. Chains are built from the parent
+    links when asked for, and the most recently used ones are remembered.
+
+    The graph is a snapshot: build a new one after changing the quest
+    data. main builds one each time the catalog is loaded and passes it
+    around.
+    """
+
+    def __init__(self, quest_data_dict):
+        self.quest_data_dict = quest_data_dict
+        self.parent = {}     # quest ID -> prerequisite ID (None if no prerequisite)
+        self.children = {}   # quest ID -> list of quests that need it
+        self.missing = []    # (quest ID, prerequisite ID) for prerequisites that don't exist
+        self.order = []      # Topological order
+        self.depth = {}      # quest ID -> number of prerequisites before it
+        self._chains = OrderedDict()  # Recently used chains, oldest first
+
+        roots = []
+        for qid, quest in quest_data_dict.items():
+            prereq = quest.get('prerequisite', 'NONE')
+            if prereq == 'NONE':
+                self.parent[qid] = None
+                roots.append(qid)
+            elif prereq not in quest_data_dict:
+                # Treat it as a root so the rest of its chain is still ordered
+                self.parent[qid] = prereq
+                self.missing.append((qid, prereq))
+                roots.append(qid)
+            else:
+                self.parent[qid] = prereq
+                self.children.setdefault(prereq, []).append(qid)
+
+        # Breadth-first from the roots; quests never reached are part of
+        # (or depend on) a prerequisite cycle
+        for qid in roots:
+            self.depth[qid] = 0
+        self.order = roots
+        for qid in self.order:  # The list grows while we walk it
+            next_depth = self.depth[qid] + 1
+            for child in self.children.get(qid, ()):
+                self.depth[child] = next_depth
+                self.order.append(child)
+
+    def chain(self, quest_id):
+        """
+        Return the prerequisite chain ending at quest_id as a tuple, oldest first.
+
+        Raises:
+            QuestNotFoundError: If the quest or a prerequisite in its chain doesn't exist
+            QuestRequirementsNotMetError: If the chain loops back on itself
+        """
+        cached = self._chains.get(quest_id)
+        if cached is not None:
+            self._chains.move_to_end(quest_id)
+            return cached
+        if quest_id not in self.quest_data_dict:
+            raise QuestNotFoundError(f"Quest {quest_id} not found")
+        if quest_id not in self.depth:
+            raise QuestRequirementsNotMetError(f"Quest {quest_id} has a circular prerequisite chain")
+
+        # Walk back to the root, or to an ancestor whose chain is remembered
+        path = []
+        base = ()
+        current = quest_id
+        while current is not None:
+            if current in self._chains:
+                base = self._chains[current]
+                break
+            path.append(current)
+            if self.depth[current] == 0 and self.parent[current] is not None:
+                raise QuestNotFoundError(f"Prerequisite {self.parent[current]} does not exist")
+            current = self.parent[current]
+
+        path.reverse()
+        chain = base + tuple(path)
+        self._chains[quest_id] = chain
+        if len(self._chains) > CHAIN_CACHE_SIZE:
+            self._chains.popitem(last=False)
+        return chain
+
+
+# ============================================================================
+# AVAILABLE QUEST TRACKING
+# ============================================================================
+
+class AvailableQuestTracker:
+    """
+    Keeps the set of quests a character can accept up to date as they play.
+
+    Instead of checking every quest each time the quest board is shown, the
+    tracker is told about each accept, complete and abandon and only looks
+    at the quests those actions can affect: completing a quest can unlock
+    the quests that need it, and levelling up can unlock quests waiting for
+    that level. Quests whose prerequisite is done but whose level is too
+    high wait in a bucket for their required level.
+
+    Attach it with attach_quest_tracker(); accept_quest, complete_quest and
+    abandon_quest keep it updated. Changes made by editing the character's
+    quest lists directly are not seen - call rebuild() after doing that.
+    """
+
+    def __init__(self, character, quest_data_dict, graph=None):
+        self.character = character
+        self.quest_data_dict = quest_data_dict
+        self.graph = graph if graph is not None else QuestGraph(quest_data_dict)
+        self.position = {qid: i for i, qid in enumerate(quest_data_dict)}
+        self.rebuild()
+
+    def rebuild(self):
+        """Work out every available quest from scratch."""
+        self.level = self.character.get('level', 1)
+        self.available = set()
+        self.waiting_for_level = {}  # required level -> set of quest IDs
+        self._board = None  # Cached sorted list of available quests
+        for qid in self.quest_data_dict:
+            self._place(qid)
+
+    def _place(self, quest_id):
+        """Put one quest in the available set or a level bucket if it qualifies."""
+        character = self.character
+        if quest_id in character.get('completed_quests', []) or quest_id in character.get('active_quests', []):
+            return
+        quest = self.quest_data_dict[quest_id]
+        prereq = quest.get('prerequisite', 'NONE')
+        if prereq != 'NONE' and prereq not in character.get('completed_quests', []):
+            return
+
+        required = quest.get('required_level', 1)
+        if required <= self.level:
+            self.available.add(quest_id)
+            self._board = None
+        else:
+            self.waiting_for_level.setdefault(required, set()).add(quest_id)
+
+    def _remove(self, quest_id):
+        """Take a quest out of the available set and any level bucket."""
+        if quest_id in self.available:
+            self.available.discard(quest_id)
+            self._board = None
+        required = self.quest_data_dict[quest_id].get('required_level', 1)
+        waiting = self.waiting_for_level.get(required)
+        if waiting:
+            waiting.discard(quest_id)
+
+    def sync_level(self):
+        """Unlock quests waiting for any levels gained since the last check."""
+        new_level = self.character.get('level', 1)
+        if new_level == self.level:
+            return
+        if new_level < self.level:
+            self.rebuild()  # Levels going down is rare; just start over
+            return
+        old_level = self.level
+        self.level = new_level
+        for level in range(old_level + 1, new_level + 1):
+            unlocked = self.waiting_for_level.pop(level, None)
+            if unlocked:
+                self.available.update(unlocked)
+                self._board = None
+
+    def quest_accepted(self, quest_id):
+        self._remove(quest_id)
+
+    def quest_abandoned(self, quest_id):
+        self._place(quest_id)
+
+    def quest_completed(self, quest_id):
+        self._remove(quest_id)
+        for child in self.graph.children.get(quest_id, ()):
+            self._place(child)
+
+    def get_available_quest_ids(self):
+        """Return IDs of quests that can be accepted now, in catalog order."""
+        self.sync_level()
+        if self._board is None:
+            self._board = sorted(self.available, key=self.position.__getitem__)
+        return list(self._board)
+
+    def get_available_quests(self):
+        """Return full quest data for quests that can be accepted now."""
+        quests = self.quest_data_dict
+        return [quests[qid] for qid in self.get_available_quest_ids()]
+
+
+def attach_quest_tracker(character, quest_data_dict, graph=None):
+    """
+    Create an AvailableQuestTracker for a character and store it on them.
+    Pass the QuestGraph already built for quest_data_dict to reuse it.
+    """
+    tracker = AvailableQuestTracker(character, quest_data_dict, graph)
+    character['quest_tracker'] = tracker
+    return tracker
+
+
+# ============================================================================
+# QUEST EVENTS
+# ============================================================================
+
+# rewards is {'xp': ..., 'gold': ...} for completed quests and None otherwise.
+# character is the live character dictionary, so background subscribers may
+# see it after later changes.
+QuestEvent = namedtuple("QuestEvent", ["kind", "character", "quest_id", "rewards"])
+
+_STOP = object()  # Tells a background subscriber's thread to finish
+CLOSE_TIMEOUT = 5.0  # Seconds close() waits on a background subscriber
+ERROR_HISTORY = 20  # Callback errors each subscriber keeps
+
+
+class QuestSubscription:
+    """
+    One subscriber to a QuestEventBus.
+
+    "sync" subscribers are called with each event right away, inside the
+    quest action. "async" subscribers get events through a queue that a
+    background thread drains, so a slow subscriber does not slow the game
+    down. Background callbacks are called with a list of up to batch_size
+    events; after the first event the thread waits up to batch_wait seconds
+    for the batch to fill.
+
+    When a background queue holds max_queue events, overflow decides what
+    happens to the next one: "block" waits for room, "drop_newest" throws
+    the new event away and "drop_oldest" throws away the oldest queued one.
+    Dropped events are counted in self.dropped. Exceptions raised by the
+    callback don't reach the quest code: they are counted in
+    self.error_count and the last ERROR_HISTORY of them are kept in
+    self.errors as (event or batch, exception) pairs.
+    """
+
+    MODES = ("sync", "async")
+    OVERFLOW_POLICIES = ("block", "drop_newest", "drop_oldest")
+
+    def __init__(self, callback, kinds=None, mode="sync", batch_size=1,
+                 max_queue=1000, overflow="block", batch_wait=0.0):
+        if mode not in self.MODES:
+            raise ValueError("Unknown delivery mode: " + str(mode))
+        if overflow not in self.OVERFLOW_POLICIES:
+            raise ValueError("Unknown overflow policy: " + str(overflow))
+        if batch_size < 1 or max_queue < 1:
+            raise ValueError("batch_size and max_queue must be at least 1")
+
+        self.callback = callback
+        self.kinds = None if kinds is None else frozenset(kinds)
+        self.mode = mode
+        self.batch_size = batch_size
+        self.overflow = overflow
+        self.batch_wait = batch_wait
+        self.delivered = 0
+        self.dropped = 0
+        self.error_count = 0
+        self.errors = deque(maxlen=ERROR_HISTORY)
+        self.closed = False
+        self._abandoned = False  # Set when close() gives up on the queue
+
+        self.queue = None
+        self.thread = None
+        if mode == "async":
+            self.queue = queue.Queue(max_queue)
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+
+    def wants(self, kind):
+        """Return True if this subscriber listens to events of this kind."""
+        return self.kinds is None or kind in self.kinds
+
+    def _record_error(self, events, error):
+        self.error_count += 1
+        self.errors.append((events, error))
+
+    def deliver(self, event):
+        """Call the subscriber now, or queue the event for its thread."""
+        if self.closed:
+            self.dropped += 1
+            return
+        if self.queue is None:
+            try:
+                self.callback(event)
+            except Exception as e:
+                self._record_error(event, e)
+            self.delivered += 1
+            return
+
+        if self.overflow == "block":
+            self.queue.put(event)
+        elif self.overflow == "drop_newest":
+            try:
+                self.queue.put_nowait(event)
+            except queue.Full:
+                self.dropped += 1
+        else:
+            # drop_oldest: make room by throwing away queued events
+            while True:
+                try:
+                    self.queue.put_nowait(event)
+                    break
+                except queue.Full:
+                    try:
+                        self.queue.get_nowait()
+                        self.queue.task_done()
+                        self.dropped += 1
+                    except queue.Empty:
+                        pass
+
+    def _run(self):
+        # Background thread: take events off the queue in batches
+        stopping = False
+        while not stopping:
+            event = self.queue.get()
+            if event is _STOP:
+                self.queue.task_done()
+                break
+
+            batch = [event]
+            deadline = time.monotonic() + self.batch_wait
+            while len(batch) < self.batch_size:
+                try:
+                    wait = deadline - time.monotonic()
+                    if wait > 0:
+                        event = self.queue.get(timeout=wait)
+                    else:
+                        event = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if event is _STOP:
+                    self.queue.task_done()
+                    stopping = True
+                    break
+                batch.append(event)
+
+            try:
+                self.callback(batch)
+            except Exception as e:
+                self._record_error(batch, e)
+            self.delivered += len(batch)
+            for _ in batch:
+                self.queue.task_done()
+            if self._abandoned:
+                break  # close() timed out; leave the rest
+
+    def flush(self):
+        """Wait until every queued event has been handled."""
+        if self.queue is not None:
+            self.queue.join()
+
+    def close(self, timeout=CLOSE_TIMEOUT):
+        """
+        Stop taking events, let the background thread handle what is
+        queued, then stop it.
+
+        Waits at most about timeout seconds per step. If the queue stays
+        full (for example the callback is stuck), the queued events are
+        given up on and the thread stops after its current batch.
+
+        Returns:
+            bool: True if the background thread has stopped
+        """
+        self.closed = True
+        if self.thread is None or not self.thread.is_alive():
+            return True
+        try:
+            self.queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            self._abandoned = True
+            self.dropped += self.queue.qsize()
+        self.thread.join(timeout)
+        return not self.thread.is_alive()
+
+
+class QuestEventBus:
+    """
+    Sends QuestEvents to subscribers after quests are accepted, completed
+    or abandoned, so other systems don't have to poll character lists.
+
+    Example:
+        sub = quest_events.subscribe(print, kinds=[QUEST_COMPLETED])
+        ...
+        quest_events.unsubscribe(sub)
+    """
+
+    def __init__(self):
+        self.subscriptions = ()  # Replaced, never changed, so emit needs no lock
+        self.lock = threading.Lock()
+
+    def subscribe(self, callback, kinds=None, mode="sync", batch_size=1,
+                  max_queue=1000, overflow="block", batch_wait=0.0):
+        """
+        Add a subscriber. See QuestSubscription for what the options do.
+
+        Returns:
+            QuestSubscription: Pass it to unsubscribe() to stop receiving events
+        """
+        subscription = QuestSubscription(callback, kinds, mode, batch_size,
+                                         max_queue, overflow, batch_wait)
+        with self.lock:
+            self.subscriptions = self.subscriptions + (subscription,)
+        return subscription
+
+    def unsubscribe(self, subscription, timeout=CLOSE_TIMEOUT):
+        """
+        Remove a subscriber after it has handled its queued events.
+
+        Returns:
+            bool: False if a background subscriber was still busy after
+                  timeout (see QuestSubscription.close)
+        """
+        with self.lock:
+            self.subscriptions = tuple(s for s in self.subscriptions if s is not subscription)
+        return subscription.close(timeout)
+
+    def emit(self, kind, character, quest_id, rewards=None):
+        """Send an event to every subscriber that listens to its kind."""
+        subscriptions = self.subscriptions
+        if not subscriptions:
+            return
+        event = QuestEvent(kind, character, quest_id, rewards)
+        for subscription in subscriptions:
+            if subscription.wants(kind):
+                subscription.deliver(event)
+
+    def flush(self):
+        """Wait for every background subscriber to catch up."""
+        for subscription in self.subscriptions:
+            subscription.flush()
+
+    def close(self, timeout=CLOSE_TIMEOUT):
+        """Remove every subscriber. Returns False if any was still busy."""
+        stopped = True
+        for subscription in self.subscriptions:
+            stopped = self.unsubscribe(subscription, timeout) and stopped
+        return stopped
+
+
+# The bus used by the quest functions in this module
+quest_events = QuestEventBus()
+
+
+# ============================================================================
+# QUEST OBJECTIVES
+# ============================================================================
+
+class ObjectiveTracker:
+    """
+    Counts progress on the objectives of a character's active quests.
+
+    Quests can list objectives such as ("kill", ("goblin",), 3). The tracker
+    keeps an index from (event, target) to the active quest objectives that
+    care about it, so a combat victory or a purchase only touches the quests
+    it matters to. Progress counts live in character['quest_progress'] as
+    quest ID -> list of counts (one per objective) so they can be saved.
+
+    Attach it with attach_objective_tracker(); accepting, completing and
+    abandoning quests keeps the index up to date.
+    """
+
+    def __init__(self, character, quest_data_dict):
+        self.character = character
+        self.quest_data_dict = quest_data_dict
+        self.progress = character.setdefault('quest_progress', {})
+        self.watchers = {}  # (event, target) -> set of (quest ID, objective number)
+        for quest_id in character.get('active_quests', []):
+            self.watch(quest_id)
+
+    def watch(self, quest_id):
+        """Start counting events for an active quest's objectives."""
+        quest = self.quest_data_dict.get(quest_id)
+        objectives = quest.get('objectives', ()) if quest is not None else ()
+        if not objectives:
+            return
+        counts = self.progress.get(quest_id)
+        if counts is None or len(counts) != len(objectives):
+            self.progress[quest_id] = [0] * len(objectives)
+        for number, (event, targets, needed) in enumerate(objectives):
+            for target in targets:
+                self.watchers.setdefault((event, target), set()).add((quest_id, number))
+
+    def unwatch(self, quest_id):
+        """Stop counting for a quest and forget its progress."""
+        quest = self.quest_data_dict.get(quest_id)
+        objectives = quest.get('objectives', ()) if quest is not None else ()
+        for number, (event, targets, needed) in enumerate(objectives):
+            for target in targets:
+                watching = self.watchers.get((event, target))
+                if watching is not None:
+                    watching.discard((quest_id, number))
+                    if not watching:
+                        del self.watchers[(event, target)]
+        self.progress.pop(quest_id, None)
+
+    def record(self, event, targets, amount=1):
+        """
+        Count an event for every active quest objective that matches it.
+
+        Returns:
+            list: IDs of quests whose objectives are now all complete
+        """
+        matched = set()
+        for target in tuple(targets) + ("any",):
+            matched.update(self.watchers.get((event, target), ()))
+
+        finished = []
+        for quest_id, number in matched:
+            counts = self.progress[quest_id]
+            needed = self.quest_data_dict[quest_id]['objectives'][number][2]
+            if counts[number] >= needed:
+                continue
+            counts[number] = min(needed, counts[number] + amount)
+            if counts[number] == needed and self.is_complete(quest_id) and quest_id not in finished:
+                finished.append(quest_id)
+        return finished
+
+    def is_complete(self, quest_id):
+        """Return True if every objective of the quest has been reached."""
+        objectives = self.quest_data_dict[quest_id].get('objectives', ())
+        counts = self.progress.get(quest_id, [])
+        if len(counts) != len(objectives):
+            return not objectives
+        return all(count >= objective[2] for count, objective in zip(counts, objectives))
+
+
+def attach_objective_tracker(character, quest_data_dict):
+    """Create an ObjectiveTracker for a character and store it on them."""
+    tracker = ObjectiveTracker(character, quest_data_dict)
+    character['objective_tracker'] = tracker
+    return tracker
+
+
+def record_quest_event(character, event, target, amount=1):
+    """
+    Tell the character's quests that something happened, e.g.
+    record_quest_event(hero, "kill", "goblin") after winning a battle.
+
+    target can be one name or a list of names (such as an item's ID and type).
+
+    Returns:
+        list: IDs of quests whose objectives are now all complete
+    """
+    tracker = character.get('objective_tracker')
+    if tracker is None:
+        return []
+    targets = (target,) if isinstance(target, str) else tuple(target)
+    return tracker.record(event, targets, amount)
+
+
+def get_objective_progress(character, quest_id, quest_data_dict):
+    """
+    Return a list of (event, targets, done, needed) for each objective of a quest.
+    """
+    objectives = quest_data_dict[quest_id].get('objectives', ())
+    counts = character.get('quest_progress', {}).get(quest_id, [])
+    progress = []
+    for number, (event, targets, needed) in enumerate(objectives):
+        done = counts[number] if number < len(counts) else 0
+        progress.append((event, targets, done, needed))
+    return progress
+
+
+# ============================================================================
+# ROUTE PLANNING
+# ============================================================================
+
+def plan_route(character, quest_data_dict, goal):
+    """
+    Suggest an order of quests that works toward a goal.
+
+    First, a dynamic programming pass over the quest graph (last quests
+    first) works out for every quest the most reward you can collect by
+    doing it and then the best quests that follow it. The plan is then
+    built by repeatedly doing the available quest with the best such value,
+    using character_manager.gain_experience's level curve to see when
+    higher level quests unlock. This finds good plans quickly, but it is a
+    guided greedy search, not a guaranteed best one.
+
+    Args:
+        character (dict): The character to plan for (not changed)
+        quest_data_dict (dict): All quests
+        goal (dict): {"level": N} to reach a level, or {"gold": N} to earn
+            N gold from quests ({"gold": None} collects as much as
+            possible). "max_quests" can limit the length of the plan.
+
+    Returns:
+        dict: "quests" (IDs in order), "xp", "gold", "final_level" and
+              "goal_met"
+    """
+    target_level = goal.get("level")
+    target_gold = goal.get("gold")
+    max_quests = goal.get("max_quests")
+    reward_key = 'reward_xp' if target_level is not None else 'reward_gold'
+
+    graph = QuestGraph(quest_data_dict)
+    children = graph.children
+
+    # best[q] = reward of q plus the best chain of quests after it
+    best = {}
+    for qid in reversed(graph.order):
+        follow_on = [best[child] for child in children.get(qid, ())]
+        best[qid] = quest_data_dict[qid].get(reward_key, 0) + (max(follow_on) if follow_on else 0)
+
+    # Pretend-character used to follow the level curve
+    sim = {'health': 1, 'max_health': 0, 'strength': 0, 'magic': 0,
+           'level': character.get('level', 1), 'experience': character.get('experience', 0)}
+    completed = set(character.get('completed_quests', []))
+    active = set(character.get('active_quests', []))
+    position = {qid: i for i, qid in enumerate(quest_data_dict)}
+    ready = []              # heap of (-best value, catalog position, quest ID)
+    waiting_for_level = {}  # level -> quest IDs
+
+    def place(qid):
+        # Quests in a prerequisite loop have no value and are never planned
+        if qid in completed or qid not in best:
+            return
+        quest = quest_data_dict[qid]
+        if qid not in active:
+            prereq = quest.get('prerequisite', 'NONE')
+            if prereq != 'NONE' and prereq not in completed:
+                return
+            required = quest.get('required_level', 1)
+            if required > sim['level']:
+                waiting_for_level.setdefault(required, []).append(qid)
+                return
+        heapq.heappush(ready, (-best[qid], position[qid], qid))
+
+    for qid in quest_data_dict:
+        place(qid)
+
+    plan = []
+    total_xp = 0
+    total_gold = 0
+
+    def goal_met():
+        if target_level is not None:
+            return sim['level'] >= target_level
+        if target_gold is not None:
+            return total_gold >= target_gold
+        return False
+
+    while ready and not goal_met():
+        if max_quests is not None and len(plan) >= max_quests:
+            break
+        qid = heapq.heappop(ready)[2]
+        quest = quest_data_dict[qid]
+        plan.append(qid)
+        completed.add(qid)
+        total_xp += quest.get('reward_xp', 0)
+        total_gold += quest.get('reward_gold', 0)
+
+        old_level = sim['level']
+        character_manager.gain_experience(sim, quest.get('reward_xp', 0))
+        for level in range(old_level + 1, sim['level'] + 1):
+            for waiting in waiting_for_level.pop(level, ()):
+                heapq.heappush(ready, (-best[waiting], position[waiting], waiting))
+        for child in children.get(qid, ()):
+            place(child)
+
+    return {
+        'quests': plan,
+        'xp': total_xp,
+        'gold': total_gold,
+        'final_level': sim['level'],
+        'goal_met': goal_met() if (target_level is not None or target_gold is not None) else True
+    }
+
+
 # ============================================================================ 
 # QUEST STATISTICS
 # ============================================================================
@@ -189,19 +1003,56 @@ def get_quest_completion_percentage(character, quest_data_dict):
     return (completed / total) * 100.0
 
 
-def get_total_quest_rewards_earned(character, quest_data_dict):
-    """Calculate total XP and Gold earned from completed quests."""
-    total_xp = 0
-    total_gold = 0
-    for qid in character.get('completed_quests', []):
-        quest = quest_data_dict.get(qid, {})
-        total_xp += quest.get('reward_xp', 0)
-        total_gold += quest.get('reward_gold', 0)
-    return {'total_xp': total_xp, 'total_gold': total_gold}
-
-
-def get_quests_by_level(quest_data_dict, min_level, max_level):
-    """Return quests within a certain level range."""
+def get_total_quest_rewards_earned(character, quest_data_dict, quest_table=None):
+    """
+    Return total XP and Gold earned from completed quests.
+
+    Characters keep running totals that complete_quest adds to, so this is
+    normally just a lookup. If a character has no totals yet (for example an
+    old save) they are worked out once from the completed quests and stored.
+    """
+    if 'quest_xp_earned' not in character or 'quest_gold_earned' not in character:
+        rebuild_quest_totals(character, quest_data_dict, quest_table)
+    return {'total_xp': character['quest_xp_earned'], 'total_gold': character['quest_gold_earned']}
+
+
+def rebuild_quest_totals(character, quest_data_dict, quest_table=None):
+    """Recalculate and store a character's running quest reward totals."""
+    totals = calculate_quest_rewards(character, quest_data_dict, quest_table)
+    character['quest_xp_earned'] = totals['total_xp']
+    character['quest_gold_earned'] = totals['total_gold']
+    return totals
+
+
+def check_quest_totals(character, quest_data_dict, quest_table=None):
+    """
+    Return True if the character's running totals match a full recount of
+    their completed quests, False if they have drifted apart (or are missing).
+    """
+    actual = calculate_quest_rewards(character, quest_data_dict, quest_table)
+    return (character.get('quest_xp_earned') == actual['total_xp'] and
+            character.get('quest_gold_earned') == actual['total_gold'])
+
+
+def calculate_quest_rewards(character, quest_data_dict, quest_table=None):
+    """
+    Add up XP and Gold from every completed quest, ignoring running totals.
+    Pass a game_data.QuestTable built from quest_data_dict to sum the
+    reward columns instead of looking up each quest dictionary.
+    """
+    if quest_table is not None:
+        return quest_table.total_rewards(character.get('completed_quests', []))
+    return character_manager.count_quest_rewards(character.get('completed_quests', []), quest_data_dict)
+
+
+def get_quests_by_level(quest_data_dict, min_level, max_level, quest_table=None):
+    """
+    Return quests within a certain level range.
+    Pass a game_data.QuestTable built from quest_data_dict to find them by
+    binary search over the level column instead of checking every quest.
+    """
+    if quest_table is not None:
+        return [quest_data_dict[qid] for qid in quest_table.quest_ids_by_level(min_level, max_level)]
     return [q for q in quest_data_dict.values() if min_level <= q.get('required_level', 1) <= max_level]
 
 
@@ -209,34 +1060,177 @@ def get_quests_by_level(quest_data_dict, min_level, max_level):
 # DISPLAY FUNCTIONS
 # ============================================================================
 
-def display_quest_info(quest_data):
+# Quest boards are built as one string and written in a single call.
+# Formatted table rows are cached per quest and column layout, and only
+# redone when the quest's shown values change. The cache is only filled
+# once a layout is drawn a second time (a refresh).
+DEFAULT_PAGE_SIZE = 20
+MIN_TITLE_WIDTH = 10
+MAX_ID_WIDTH = 24
+ROW_CACHE_LIMIT = 200000
+_row_cache = {}  # (quest ID, id width, title width) -> (shown values, row text)
+_row_layouts = set()  # (id width, title width) pairs drawn at least once
+
+
+def write_output(text, stream=None):
+    """Write text to stream (stdout by default) with one write call."""
+    if stream is None:
+        stream = sys.stdout
+    stream.write(text)
+
+
+def get_display_width(width=None):
+    """Return the width to draw tables at (the terminal width if not given)."""
+    if width is None:
+        width = shutil.get_terminal_size((80, 24)).columns
+    return width
+
+
+def fit_text(text, width):
+    """Pad or cut text to exactly width characters."""
+    if len(text) <= width:
+        return text.ljust(width)
+    if width <= 3:
+        return text[:width]
+    return text[:width - 3] + "..."
+
+
+def get_page(items, page, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Return (items on the page, page number, page count) for a 1-based page.
+
+    Page numbers past either end are moved to the first or last page.
+    """
+    page_count = max(1, (len(items) + page_size - 1) // page_size)
+    page = min(max(page, 1), page_count)
+    start = (page - 1) * page_size
+    return items[start:start + page_size], page, page_count
+
+
+def build_quest_row(quest, id_width, title_width):
+    """Return one table row for a quest, without using the row cache."""
+    get = quest.get
+    quest_id = get('quest_id', '')
+    title = get('title', 'Unknown')
+    # Most text just needs padding, which is cheaper than calling fit_text
+    quest_id = quest_id.ljust(id_width) if len(quest_id) <= id_width else fit_text(quest_id, id_width)
+    title = title.ljust(title_width) if len(title) <= title_width else fit_text(title, title_width)
+    return (f"{quest_id}  {title}  {get('required_level', 1):>3}  "
+            f"{get('reward_xp', 0):>6}  {get('reward_gold', 0):>6}")
+
+
+def format_quest_row(quest, id_width, title_width):
+    """Return one table row for a quest, reusing the cached text if unchanged."""
+    quest_id = quest.get('quest_id', '')
+    shown = (quest_id, quest.get('title', 'Unknown'), quest.get('required_level', 1),
+             quest.get('reward_xp', 0), quest.get('reward_gold', 0))
+    key = (quest_id, id_width, title_width)
+    cached = _row_cache.get(key)
+    if cached is not None and cached[0] == shown:
+        return cached[1]
+
+    row = build_quest_row(quest, id_width, title_width)
+    if len(_row_cache) >= ROW_CACHE_LIMIT:
+        _row_cache.clear()
+    _row_cache[key] = (shown, row)
+    return row
+
+
+def format_quest_table(quest_list, width=None, page=None, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Format quests as a table that fits in width columns.
+
+    Args:
+        quest_list: List of quest dictionaries
+        width: Line width (defaults to the terminal width)
+        page: 1-based page to show, or None to show every quest
+        page_size: Quests per page
+
+    Returns:
+        str: The table text, ending with a newline
+    """
+    quest_list = list(quest_list)
+    page_count = 1
+    if page is not None:
+        quest_list, page, page_count = get_page(quest_list, page, page_size)
+
+    # Numbers get fixed columns, the title takes whatever is left
+    width = get_display_width(width)
+    id_width = min(MAX_ID_WIDTH, max([2] + [len(q.get('quest_id', '')) for q in quest_list]))
+    title_width = max(MIN_TITLE_WIDTH, width - id_width - 23)
+
+    lines = [f"{fit_text('ID', id_width)}  {fit_text('Title', title_width)}  "
+             f"{'Lvl':>3}  {'XP':>6}  {'Gold':>6}"]
+    lines.append("-" * len(lines[0]))
+    # The first board drawn at a layout skips the cache, so a one-off
+    # render costs no more than plain formatting. Redraws fill and use it.
+    layout = (id_width, title_width)
+    if layout in _row_layouts:
+        lines.extend([format_quest_row(quest, id_width, title_width) for quest in quest_list])
+    else:
+        _row_layouts.add(layout)
+        lines.extend([build_quest_row(quest, id_width, title_width) for quest in quest_list])
+    if page is not None:
+        lines.append(f"Page {page} of {page_count}")
+    return "\n".join(lines) + "\n"
+
+
+def format_quest_info(quest_data):
+    """Return the detail view of one quest as a string."""
+    return (f"\n=== {quest_data.get('title', 'Unknown Quest')} ===\n"
+            f"Description: {quest_data.get('description', '')}\n"
+            f"Required Level: {quest_data.get('required_level', 1)}\n"
+            f"Prerequisite: {quest_data.get('prerequisite', 'NONE')}\n"
+            f"Rewards: XP={quest_data.get('reward_xp', 0)}, Gold={quest_data.get('reward_gold', 0)}\n\n")
+
+
+def format_character_quest_progress(character, quest_data_dict):
+    """Return the character's quest progress summary as a string."""
+    active_count = len(character.get('active_quests', []))
+    completed_count = len(character.get('completed_quests', []))
+    percent = get_quest_completion_percentage(character, quest_data_dict)
+    rewards = get_total_quest_rewards_earned(character, quest_data_dict)
+
+    return (f"Active Quests: {active_count}\n"
+            f"Completed Quests: {completed_count}\n"
+            f"Completion: {percent:.2f}%\n"
+            f"Total XP Earned: {rewards['total_xp']}\n"
+            f"Total Gold Earned: {rewards['total_gold']}\n")
+
+
+def display_quest_info(quest_data, stream=None):
     # Show quest details
-    print(f"\n=== {quest_data.get('title', 'Unknown Quest')} ===")
-    print(f"Description: {quest_data.get('description', '')}")
-    print(f"Required Level: {quest_data.get('required_level', 1)}")
-    print(f"Prerequisite: {quest_data.get('prerequisite', 'NONE')}")
-    print(f"Rewards: XP={quest_data.get('reward_xp', 0)}, Gold={quest_data.get('reward_gold', 0)}\n")
+    write_output(format_quest_info(quest_data), stream)
 
 
-def display_quest_list(quest_list):
-    # Show a list of quests with basic info
-    for quest in quest_list:
-        print(f"{quest.get('title', 'Unknown')} - Level {quest.get('required_level', 1)}, "
-              f"XP: {quest.get('reward_xp', 0)}, Gold: {quest.get('reward_gold', 0)}")
+def display_quest_list(quest_list, page=None, page_size=DEFAULT_PAGE_SIZE, width=None, stream=None):
+    # Show a table of quests with basic info
+    write_output(format_quest_table(quest_list, width, page, page_size), stream)
 
 
-def display_character_quest_progress(character, quest_data_dict):
+def display_character_quest_progress(character, quest_data_dict, stream=None):
     # Show the character's quest progress
-    active_count = len(character.get('active_quests', []))
-    completed_count = len(character.get('completed_quests', []))
-    percent = get_quest_completion_percentage(character, quest_data_dict)
-    rewards = get_total_quest_rewards_earned(character, quest_data_dict)
+    write_output(format_character_quest_progress(character, quest_data_dict), stream)
+
+
+def display_quest_board(title, quest_list, page=None, page_size=DEFAULT_PAGE_SIZE, width=None, stream=None):
+    # Show a titled table, or a note if there is nothing to list
+    if not quest_list:
+        write_output(f"\n=== {title} ===\nNo quests.\n", stream)
+        return
+    write_output(f"\n=== {title} ===\n" + format_quest_table(quest_list, width, page, page_size), stream)
+
+
+def display_active_quests(character, quest_data_dict, page=None, stream=None):
+    display_quest_board("ACTIVE QUESTS", get_active_quests(character, quest_data_dict), page, stream=stream)
 
-    print(f"Active Quests: {active_count}")
-    print(f"Completed Quests: {completed_count}")
-    print(f"Completion: {percent:.2f}%")
-    print(f"Total XP Earned: {rewards['total_xp']}")
-    print(f"Total Gold Earned: {rewards['total_gold']}")
+
+def display_available_quests(character, quest_data_dict, page=None, stream=None):
+    display_quest_board("AVAILABLE QUESTS", get_available_quests(character, quest_data_dict), page, stream=stream)
+
+
+def display_completed_quests(character, quest_data_dict, page=None, stream=None):
+    display_quest_board("COMPLETED QUESTS", get_completed_quests(character, quest_data_dict), page, stream=stream)
 
 
 # ============================================================================ 
@@ -245,14 +1239,90 @@ def display_character_quest_progress(character, quest_data_dict):
 
 def validate_quest_prerequisites(quest_data_dict):
     """Check all prerequisites exist in quest data."""
-    for qid, quest in quest_data_dict.items():
-        prereq = quest.get('prerequisite', 'NONE')
-        if prereq != 'NONE' and prereq not in quest_data_dict:
-            raise QuestNotFoundError(f"Quest {qid} has invalid prerequisite {prereq}")
+    for qid, prereq in QuestGraph(quest_data_dict).missing:
+        raise QuestNotFoundError(f"Quest {qid} has invalid prerequisite {prereq}")
     return True
 
 
 
+
+def validate_quest_graph(quest_data_dict, graph=None):
+    """
+    Check the whole prerequisite graph and report every problem found.
+
+    Runs in time proportional to the number of quests. Pass the QuestGraph
+    already built for quest_data_dict to reuse it.
+
+    Returns:
+        dict: Lists of problems:
+            "dangling": (quest ID, missing prerequisite ID) pairs
+            "cycles": lists of quest IDs that form a prerequisite loop
+            "unreachable": quests that can never be unlocked from a quest
+                with no prerequisite (because of a loop or missing quest)
+            "level_conflicts": (quest ID, prerequisite ID, level, prerequisite level)
+                where a quest needs a lower level than its prerequisite
+    """
+    if graph is None:
+        graph = QuestGraph(quest_data_dict)
+    parent = graph.parent
+
+    # Quests in topological order are reachable if their parent is
+    reachable = set()
+    for qid in graph.order:
+        prereq = parent[qid]
+        if prereq is None or prereq in reachable:
+            reachable.add(qid)
+    unreachable = [qid for qid in quest_data_dict if qid not in reachable]
+
+    # Quests the graph could not order are in a loop or below one. Follow
+    # prerequisite links from each; every quest has at most one, so a walk
+    # that comes back to its own path has found a loop.
+    cycles = []
+    state = {}  # quest ID -> 1 while on the current walk, 2 when finished
+    for start in quest_data_dict:
+        if start in graph.depth or start in state:
+            continue
+        path = []
+        current = start
+        while current is not None and current in quest_data_dict and current not in state:
+            state[current] = 1
+            path.append(current)
+            current = parent[current]
+        if current is not None and state.get(current) == 1:
+            cycles.append(path[path.index(current):])
+        for qid in path:
+            state[qid] = 2
+
+    level_conflicts = []
+    for qid, quest in quest_data_dict.items():
+        prereq = parent[qid]
+        if prereq is not None and prereq in quest_data_dict:
+            level = quest.get('required_level', 1)
+            prereq_level = quest_data_dict[prereq].get('required_level', 1)
+            if level < prereq_level:
+                level_conflicts.append((qid, prereq, level, prereq_level))
+
+    return {
+        'dangling': list(graph.missing),
+        'cycles': cycles,
+        'unreachable': unreachable,
+        'level_conflicts': level_conflicts
+    }
+
+
+def format_quest_graph_problems(report):
+    """Turn a validate_quest_graph report into readable lines."""
+    lines = []
+    for qid, prereq in report['dangling']:
+        lines.append(f"Quest {qid} has invalid prerequisite {prereq}")
+    for cycle in report['cycles']:
+        lines.append("Prerequisite loop: " + " -> ".join(cycle + [cycle[0]]))
+    for qid in report['unreachable']:
+        lines.append(f"Quest {qid} can never be unlocked")
+    for qid, prereq, level, prereq_level in report['level_conflicts']:
+        lines.append(f"Quest {qid} needs level {level} but its prerequisite {prereq} needs level {prereq_level}")
+    return lines
+
 # ============================================================================
 # TESTING
 # ============================================================================
@@ -139,6 +139,21 @@ def test_quest_not_active_exception():
     with pytest.raises(QuestNotActiveError):
         quest_handler.complete_quest(char, "test_quest", quests)
 
+def test_prerequisite_chain_errors():
+    """Test that broken or circular chains raise instead of looping"""
+    quests = {
+        'a': {'prerequisite': 'b'},
+        'b': {'prerequisite': 'a'},
+        'c': {'prerequisite': 'ghost'}
+    }
+    
+    with pytest.raises(QuestRequirementsNotMetError):
+        quest_handler.get_quest_prerequisite_chain('a', quests)
+    with pytest.raises(QuestNotFoundError):
+        quest_handler.get_quest_prerequisite_chain('c', quests)
+    with pytest.raises(QuestNotFoundError):
+        quest_handler.validate_quest_prerequisites(quests)
+
 # ============================================================================
 # GAME DATA EXCEPTION TESTS
 # ============================================================================
@@ -160,6 +175,38 @@ def test_invalid_data_format_exception():
     finally:
         os.remove("test_bad_data.txt")
 
+def test_block_parser_rejects_bad_fields():
+    """Test that the schema parser reports bad values and missing fields"""
+    good = ["ITEM_ID: potion", "NAME: Potion", "TYPE: consumable",
+            "EFFECT: health:5", "COST: 5", "DESCRIPTION: Heals"]
+    assert game_data.parse_item_block(good)['cost'] == 5
+    
+    for bad in (good[:4] + ["COST: five"] + good[5:],
+                good[:2] + ["TYPE: hat"] + good[3:],
+                good + ["COLOR: red"],
+                good[1:]):
+        with pytest.raises(InvalidDataFormatError):
+            game_data.parse_item_block(bad)
+
+def test_malformed_effect_fails_at_load():
+    """Test that a bad EFFECT is rejected when items are loaded"""
+    lines = ["ITEM_ID: potion", "NAME: Potion", "TYPE: consumable",
+             "EFFECT: health:lots", "COST: 5", "DESCRIPTION: Heals"]
+    
+    with pytest.raises(InvalidDataFormatError):
+        game_data.parse_item_block(lines)
+
+def test_parallel_load_duplicate_id_exception(tmp_path):
+    """Test that duplicate IDs are reported when loading in parallel"""
+    block = ("ITEM_ID: potion\nNAME: Potion\nTYPE: consumable\n"
+             "EFFECT: health:5\nCOST: 5\nDESCRIPTION: Heals\n\n")
+    item_file = tmp_path / "items.txt"
+    item_file.write_text(block * 4)
+    
+    with pytest.raises(InvalidDataFormatError):
+        game_data.load_catalog_parallel(str(item_file), "items",
+                                        workers=2, min_parallel_size=0)
+
 # ============================================================================
 # COMBAT EXCEPTION TESTS
 # ============================================================================
@@ -6,6 +6,9 @@ Tests that modules work together correctly
 import pytest
 import sys
 import os
+import threading
+import time
+from pathlib import Path
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -40,6 +43,257 @@ def test_character_creation_and_saving():
     # Cleanup
     character_manager.delete_character("IntegrationTest")
 
+def test_save_is_atomic_at_every_durability_level(tmp_path, monkeypatch):
+    """Test that saves replace the old file whole and never leave it cut off"""
+    char = character_manager.create_character("AtomicTest", "Mage")
+    for level in character_manager.DURABILITY_LEVELS:
+        char['gold'] += 1
+        assert character_manager.save_character(char, str(tmp_path), durability=level) == True
+        assert character_manager.load_character("AtomicTest", str(tmp_path))['gold'] == char['gold']
+    with pytest.raises(ValueError):
+        character_manager.save_character(char, str(tmp_path), durability="paranoid")
+    
+    # Saves get normal file permissions, and keep ones set by hand
+    save_file = Path(character_manager.get_save_filename("AtomicTest", str(tmp_path)))
+    if os.name == "posix":
+        plain_file = tmp_path / "plain.txt"
+        plain_file.write_text("")  # What open() gives under the current umask
+        assert save_file.stat().st_mode & 0o777 == plain_file.stat().st_mode & 0o777
+        save_file.chmod(0o640)
+        character_manager.save_character(char, str(tmp_path))
+        assert save_file.stat().st_mode & 0o777 == 0o640
+    
+    # A crash before the rename keeps the old save and cleans up the temp file
+    before = save_file.read_text()
+    def crash(src, dst):
+        raise OSError("disk unplugged")
+    monkeypatch.setattr(character_manager.os, "replace", crash)
+    char['gold'] = 0
+    assert character_manager.save_character(char, str(tmp_path)) == False
+    assert save_file.read_text() == before
+    assert sorted(p.name for p in save_file.parent.iterdir()) == ["AtomicTest_save.txt"]
+
+def test_binary_saves_round_trip_and_are_detected(tmp_path):
+    """Test that binary saves load the same character as text saves"""
+    char = character_manager.create_character("BinaryTest", "Cleric")
+    char['inventory'] = ['health_potion', 'iron_sword']
+    char['completed_quests'].extend(['first_steps', 'goblin_hunter'])
+    char['active_quests'].append('orc_menace')
+    char['quest_xp_earned'] = 150
+    char['quest_progress'] = {'orc_menace': [2]}
+    
+    character_manager.save_character(char, str(tmp_path), format="text")
+    from_text = character_manager.load_character("BinaryTest", str(tmp_path))
+    character_manager.save_character(char, str(tmp_path), format="binary")
+    save_file = Path(character_manager.get_save_filename("BinaryTest", str(tmp_path)))
+    assert save_file.read_bytes().startswith(character_manager.SAVE_MAGIC)
+    from_binary = character_manager.load_character("BinaryTest", str(tmp_path))
+    
+    assert from_binary == from_text
+    assert from_binary['quest_progress'] == {'orc_menace': [2]}
+    assert isinstance(from_binary['completed_quests'], character_manager.QuestList)
+    
+    # Damaged or future saves are refused
+    raw = save_file.read_bytes()
+    save_file.write_bytes(raw[:-3])
+    with pytest.raises(character_manager.InvalidSaveDataError):
+        character_manager.load_character("BinaryTest", str(tmp_path))
+    save_file.write_bytes(raw[:4] + b"\x63\x00" + raw[6:])
+    with pytest.raises(character_manager.InvalidSaveDataError):
+        character_manager.load_character("BinaryTest", str(tmp_path))
+    with pytest.raises(ValueError):
+        character_manager.save_character(char, str(tmp_path), format="xml")
+
+def test_save_manifest_lists_without_opening_saves(tmp_path, monkeypatch):
+    """Test that the save listing comes from the manifest and repairs itself"""
+    folder = str(tmp_path)
+    for name, cls in [("Ann", "Mage"), ("Bo", "Rogue")]:
+        character_manager.save_character(character_manager.create_character(name, cls), folder)
+    
+    # First listing scans the folder and writes the manifest
+    names = [e['name'] for e in character_manager.list_saved_characters(folder)]
+    assert names == ["Ann", "Bo"]
+    assert (tmp_path / character_manager.MANIFEST_FILENAME).exists()
+    
+    # Saves and deletes are journaled, so listing never reads a save file
+    def no_reading(filename):
+        raise AssertionError("listing opened " + filename)
+    monkeypatch.setattr(character_manager, "read_save_summary", no_reading)
+    cid = character_manager.create_character("Cid", "Cleric")
+    cid['level'] = 7
+    character_manager.save_character(cid, folder, format="binary")
+    character_manager.delete_character("Ann", folder)
+    saves = character_manager.list_saved_characters(folder)
+    assert [(e['name'], e['class'], e['level']) for e in saves] == [("Bo", "Rogue", 1), ("Cid", "Cleric", 7)]
+    monkeypatch.undo()
+    
+    # An old flat save copied in by hand is found, only that file is opened
+    bo_save = Path(character_manager.get_save_filename("Bo", folder))
+    (tmp_path / "Dee_save.txt").write_text(bo_save.read_text().replace("Bo", "Dee"))
+    os.utime(folder, ns=(0, os.stat(tmp_path / character_manager.MANIFEST_FILENAME).st_mtime_ns + 10**9))
+    opened = []
+    real_summary = character_manager.read_save_summary
+    monkeypatch.setattr(character_manager, "read_save_summary",
+                        lambda filename: opened.append(filename) or real_summary(filename))
+    names = [e['name'] for e in character_manager.list_saved_characters(folder)]
+    assert names == ["Bo", "Cid", "Dee"]
+    assert [os.path.basename(f) for f in opened] == ["Dee_save.txt"]
+    
+    # A cut-off journal line triggers a rebuild too
+    with open(tmp_path / character_manager.MANIFEST_FILENAME, "a") as f:
+        f.write("SAVE\tEve\tMa")
+    assert [e['name'] for e in character_manager.list_saved_characters(folder)] == ["Bo", "Cid", "Dee"]
+
+def test_bulk_save_and_load_report_each_character(tmp_path, monkeypatch):
+    """Test that bulk saves and loads run in parallel and fail one entry at a time"""
+    folder = str(tmp_path)
+    party = [character_manager.create_character("Hero" + str(i), "Warrior") for i in range(20)]
+    character_manager.list_saved_characters(folder)  # Start with a manifest
+    
+    broken = {"name": "Broken"}  # Missing every stat
+    results = character_manager.save_characters(party + [broken], folder, workers=4, format="binary")
+    assert [r['ok'] for r in results] == [True] * 20 + [False]
+    assert isinstance(results[-1]['error'], KeyError)
+    
+    # The batch updated the manifest, so listing does not rescan
+    monkeypatch.setattr(character_manager, "rebuild_save_manifest",
+                        lambda *args: pytest.fail("manifest was rebuilt"))
+    assert len(character_manager.list_saved_characters(folder)) == 20
+    monkeypatch.undo()
+    
+    Path(character_manager.get_save_filename("Hero3", folder)).write_bytes(b"QCSB\x01\x00junk")
+    results = character_manager.load_characters(["Hero0", "Hero3", "Nobody", "Hero19"], folder, workers=4)
+    assert [r['name'] for r in results] == ["Hero0", "Hero3", "Nobody", "Hero19"]
+    assert results[0]['character']['name'] == "Hero0" and results[0]['error'] is None
+    assert isinstance(results[1]['error'], character_manager.InvalidSaveDataError)
+    assert isinstance(results[2]['error'], character_manager.CharacterNotFoundError)
+    assert results[2]['character'] is None
+    assert results[3]['character'] == character_manager.load_character("Hero19", folder)
+
+def test_sharded_saves_and_flat_migration(tmp_path):
+    """Test that odd names get safe sharded paths and flat saves migrate"""
+    folder = str(tmp_path)
+    names = ["Sir/Bob: the Bold", "..", "Zoë", "x" * 300]
+    for name in names:
+        assert character_manager.save_character(character_manager.create_character(name, "Warrior"), folder)
+    
+    for name in names:
+        path = character_manager.get_save_filename(name, folder)
+        assert os.path.dirname(os.path.dirname(os.path.dirname(path))) == folder
+        assert len(os.path.basename(path)) < 255
+        assert character_manager.load_character(name, folder)['name'] == name
+    assert (character_manager.get_save_filename("Sir/Bob: the Bold", folder) !=
+            character_manager.get_save_filename("Sir_Bob: the Bold", folder))
+    
+    # Old flat saves still load, then migrate into shards
+    old = character_manager.create_character("Old Timer", "Mage")
+    (tmp_path / "Old Timer_save.txt").write_text(character_manager.format_save_data(old))
+    assert character_manager.load_character("Old Timer", folder)['class'] == "Mage"
+    report = character_manager.migrate_flat_saves(folder)
+    assert report == {"moved": ["Old Timer"], "skipped": []}
+    assert not (tmp_path / "Old Timer_save.txt").exists()
+    assert os.path.exists(character_manager.get_save_filename("Old Timer", folder))
+    
+    # The listing walks the shards, even when rebuilt from scratch
+    (tmp_path / character_manager.MANIFEST_FILENAME).unlink()
+    listed = [e['name'] for e in character_manager.list_saved_characters(folder)]
+    assert listed == sorted(names + ["Old Timer"])
+    assert character_manager.delete_character("..", folder)
+    assert ".." not in [e['name'] for e in character_manager.list_saved_characters(folder, repair=True)]
+
+def test_save_during_listing_is_not_lost(tmp_path, monkeypatch):
+    """Test that a save journaled while the manifest is rewritten survives"""
+    folder = str(tmp_path)
+    late = character_manager.create_character("Late", "Mage")
+    character_manager.save_character(late, folder)
+    character_manager.save_character(character_manager.create_character("Ann", "Rogue"), folder)
+    character_manager.list_saved_characters(folder)
+    
+    # Save Late again right between reading the journal and squashing it
+    monkeypatch.setattr(character_manager, "MANIFEST_SLACK", -100)  # Always squash
+    real_write = character_manager.write_save_manifest
+    saver = threading.Thread(target=character_manager.save_character, args=(late, folder))
+    def write_with_save(save_directory, entries):
+        late['level'] = 9
+        saver.start()
+        saver.join(0.3)  # Blocks on the manifest lock, so it must not finish
+        real_write(save_directory, entries)
+    monkeypatch.setattr(character_manager, "write_save_manifest", write_with_save)
+    character_manager.list_saved_characters(folder)
+    saver.join()
+    monkeypatch.undo()
+    
+    levels = {e['name']: e['level'] for e in character_manager.list_saved_characters(folder)}
+    assert levels == {"Ann": 1, "Late": 9}
+
+def test_load_game_repairs_list_when_save_is_missing(tmp_path, monkeypatch):
+    """Test that a save deleted inside a shard folder is dropped after a failed load"""
+    import main
+    monkeypatch.chdir(tmp_path)
+    folder = os.path.join("data", "save_games")
+    for name in ["Ann", "Bo"]:
+        character_manager.save_character(character_manager.create_character(name, "Mage"), folder)
+    assert len(character_manager.list_saved_characters(folder)) == 2
+    
+    # Removing a save by hand only touches its shard folder, so the list is stale
+    os.remove(character_manager.get_save_filename("Ann", folder))
+    assert len(character_manager.list_saved_characters(folder)) == 2
+    
+    monkeypatch.setattr("builtins.input", lambda prompt="": "1")
+    main.load_game()
+    assert [e['name'] for e in character_manager.list_saved_characters(folder)] == ["Bo"]
+
+def test_dir_durability_syncs_new_shard_folders(tmp_path, monkeypatch):
+    """Test that durability="dir" fsyncs the parent of every folder it creates"""
+    synced = []
+    monkeypatch.setattr(character_manager, "sync_directory", synced.append)
+    folder = str(tmp_path / "saves")
+    character_manager.save_character(character_manager.create_character("Deep", "Mage"), folder, durability="dir")
+    
+    leaf = os.path.dirname(character_manager.get_save_filename("Deep", folder))
+    shard = os.path.dirname(leaf)
+    assert synced == [str(tmp_path), folder, shard, leaf]
+    
+    # Existing folders only need the rename synced
+    synced.clear()
+    character_manager.save_character(character_manager.create_character("Deep", "Mage"), folder, durability="dir")
+    assert synced == [leaf]
+
+def test_quest_lists_round_trip_in_order(tmp_path):
+    """Test that quest lists keep order through save/load and check membership fast"""
+    char = character_manager.create_character("QuestListTest", "Cleric")
+    for qid in ['c_quest', 'a_quest', 'b_quest']:
+        char['completed_quests'].append(qid)
+    char['completed_quests'].append('a_quest')  # Already there, ignored
+    char['active_quests'].append('d_quest')
+    
+    assert 'a_quest' in char['completed_quests']
+    assert char['completed_quests'] == ['c_quest', 'a_quest', 'b_quest']
+    assert character_manager.validate_character_data(char) == True
+    
+    character_manager.save_character(char, str(tmp_path))
+    loaded = character_manager.load_character("QuestListTest", str(tmp_path))
+    
+    assert isinstance(loaded['completed_quests'], character_manager.QuestList)
+    assert list(loaded['completed_quests']) == ['c_quest', 'a_quest', 'b_quest']
+    assert loaded['active_quests'][0] == 'd_quest'
+    
+    loaded['completed_quests'].remove('a_quest')
+    assert loaded['completed_quests'] == ['c_quest', 'b_quest']
+    with pytest.raises(ValueError):
+        loaded['completed_quests'].remove('a_quest')
+    
+    # Ends, other indexes and + behave like a list without duplicates
+    quests = loaded['completed_quests']
+    assert (quests[0], quests[-1], quests[1], quests[:1]) == ('c_quest', 'b_quest', 'b_quest', ['c_quest'])
+    with pytest.raises(IndexError):
+        character_manager.QuestList()[-1]
+    assert quests + ['z_quest', 'c_quest'] == ['c_quest', 'b_quest', 'z_quest']
+    assert ['z_quest'] + quests == ['z_quest', 'c_quest', 'b_quest']
+    assert isinstance(['z_quest'] + quests, character_manager.QuestList)
+    quests += ('y_quest',)
+    assert quests[-1] == 'y_quest' and loaded['completed_quests'] is quests
+
 def test_character_leveling_system():
     """Test that character leveling works correctly"""
     char = character_manager.create_character("LevelTest", "Mage")
@@ -104,6 +358,30 @@ def test_equipment_system():
     assert 'equipped_weapon' in char
     assert char['equipped_weapon'] == "iron_sword"
 
+def test_compiled_item_effects():
+    """Test that loaded items carry compiled effects used by equip/use"""
+    items = game_data.load_items("data/items.txt")
+    sword = items['iron_sword']
+    
+    assert isinstance(sword['effect'], game_data.ItemEffect)
+    assert str(sword['effect']) == "strength:5"
+    
+    char = character_manager.create_character("EffectTest", "Warrior")
+    original_strength = char['strength']
+    inventory_system.add_item_to_inventory(char, "iron_sword")
+    inventory_system.equip_weapon(char, "iron_sword", sword)
+    assert char['strength'] == original_strength + 5
+    inventory_system.unequip_weapon(char)
+    assert char['strength'] == original_strength
+    
+    # Multi-stat effects apply every stat
+    elixir = {'type': 'consumable', 'name': 'Elixir',
+              'effect': game_data.compile_effect("strength:2,magic:3")}
+    inventory_system.add_item_to_inventory(char, "elixir")
+    result = inventory_system.use_item(char, "elixir", elixir)
+    assert char['strength'] == original_strength + 2
+    assert "+3 magic" in result
+
 def test_shop_system():
     """Test buying and selling items"""
     char = character_manager.create_character("ShopTest", "Mage")
@@ -158,6 +436,72 @@ def test_quest_acceptance_and_completion():
     assert char['experience'] == original_xp + 50
     assert char['gold'] == original_gold + 25
 
+def test_batched_quest_actions():
+    """Test applying quest actions for several characters at once"""
+    quests = game_data.load_quests("data/quests.txt")
+    hero = character_manager.create_character("BatchHero", "Warrior")
+    sidekick = character_manager.create_character("BatchSidekick", "Mage")
+    
+    outcome = quest_handler.apply_quest_actions([
+        (hero, "accept", "first_steps"),
+        (sidekick, "accept", "first_steps"),
+        (hero, "complete", "first_steps"),
+        (hero, "complete", "first_steps"),
+        (sidekick, "accept", "dragon_slayer"),
+        (sidekick, "accept", "no_such_quest"),
+        (hero, "accept", "goblin_hunter"),
+        (sidekick, "dance", "first_steps"),
+        (sidekick, "abandon", "first_steps")
+    ], quests)
+    
+    assert outcome['results'] == [
+        quest_handler.QUEST_OK, quest_handler.QUEST_OK, quest_handler.QUEST_OK,
+        quest_handler.NOT_ACTIVE, quest_handler.LEVEL_TOO_LOW,
+        quest_handler.QUEST_NOT_FOUND, quest_handler.LEVEL_TOO_LOW,
+        quest_handler.UNKNOWN_ACTION, quest_handler.QUEST_OK
+    ]
+    assert len(outcome['rewards']) == 1
+    assert outcome['rewards'][0][0] is hero
+    assert outcome['rewards'][0][1] == {'xp': 50, 'gold': 25}
+    assert 'first_steps' in hero['completed_quests']
+    assert len(sidekick['active_quests']) == 0
+    
+    # Characters that share a name keep separate totals
+    twins = [character_manager.create_character("A", "Rogue") for _ in range(2)]
+    outcome = quest_handler.apply_quest_actions(
+        [(twin, action, "first_steps") for twin in twins for action in ("accept", "complete")], quests)
+    assert [(c is twin, r) for (c, r), twin in zip(outcome['rewards'], twins)] == [
+        (True, {'xp': 50, 'gold': 25}), (True, {'xp': 50, 'gold': 25})]
+
+def test_running_quest_totals(tmp_path):
+    """Test that reward totals are kept up to date, saved and rebuilt"""
+    quests = game_data.load_quests("data/quests.txt")
+    char = character_manager.create_character("TotalsTest", "Rogue")
+    
+    quest_handler.accept_quest(char, 'first_steps', quests)
+    quest_handler.complete_quest(char, 'first_steps', quests)
+    assert quest_handler.get_total_quest_rewards_earned(char, quests) == {'total_xp': 50, 'total_gold': 25}
+    assert quest_handler.check_quest_totals(char, quests)
+    
+    character_manager.save_character(char, str(tmp_path))
+    loaded = character_manager.load_character("TotalsTest", str(tmp_path))
+    assert loaded['quest_xp_earned'] == 50 and loaded['quest_gold_earned'] == 25
+    
+    # Older saves without totals get them rebuilt from history
+    save_file = Path(character_manager.get_save_filename("TotalsTest", str(tmp_path)))
+    lines = [l for l in save_file.read_text().splitlines() if not l.startswith("QUEST_")]
+    save_file.write_text("\n".join(lines) + "\n")
+    old = character_manager.load_character("TotalsTest", str(tmp_path), quests)
+    assert old['quest_xp_earned'] == 50
+    assert quest_handler.check_quest_totals(old, quests)  # Same recount both ways
+    lazy = character_manager.load_character("TotalsTest", str(tmp_path))
+    assert 'quest_xp_earned' not in lazy
+    assert quest_handler.get_total_quest_rewards_earned(lazy, quests)['total_gold'] == 25
+    
+    # Drift is detected
+    char['quest_gold_earned'] += 1
+    assert not quest_handler.check_quest_totals(char, quests)
+
 def test_quest_prerequisite_system():
     """Test that quest prerequisites work correctly"""
     char = character_manager.create_character("PrereqTest", "Rogue")
@@ -187,6 +531,288 @@ def test_quest_prerequisite_system():
     quest_handler.accept_quest(char, 'second_quest', quests)
     assert 'second_quest' in char['active_quests']
 
+def test_available_quest_tracker_follows_actions():
+    """Test that the tracker's quest board matches a full recheck"""
+    quests = game_data.load_quests("data/quests.txt")
+    char = character_manager.create_character("TrackerTest", "Warrior")
+    tracker = quest_handler.attach_quest_tracker(char, quests)
+    
+    def full_recheck():
+        return [q for qid, q in quests.items() if quest_handler.can_accept_quest(char, qid, quests)]
+    
+    assert quest_handler.get_available_quests(char, quests) == full_recheck()
+    
+    quest_handler.accept_quest(char, 'first_steps', quests)
+    assert 'first_steps' not in tracker.get_available_quest_ids()
+    quest_handler.complete_quest(char, 'first_steps', quests)
+    assert quest_handler.get_available_quests(char, quests) == full_recheck() == []
+    
+    character_manager.gain_experience(char, 100)  # Level 2 unlocks two quests
+    assert tracker.get_available_quest_ids() == ['goblin_hunter', 'equipment_upgrade']
+    
+    quest_handler.accept_quest(char, 'goblin_hunter', quests)
+    quest_handler.abandon_quest(char, 'goblin_hunter')
+    assert quest_handler.get_available_quests(char, quests) == full_recheck()
+
+def test_quest_graph_chains():
+    """Test prerequisite chains built from the quest graph"""
+    quests = game_data.load_quests("data/quests.txt")
+    graph = quest_handler.QuestGraph(quests)
+    
+    assert quest_handler.get_quest_prerequisite_chain('dragon_slayer', quests) == [
+        'first_steps', 'goblin_hunter', 'orc_menace', 'dragon_slayer']
+    assert quest_handler.get_quest_prerequisite_chain('dragon_slayer', quests, graph) == [
+        'first_steps', 'goblin_hunter', 'orc_menace', 'dragon_slayer']
+    assert graph.depth['dragon_slayer'] == 3
+    assert graph.chain('dragon_slayer') is graph.chain('dragon_slayer')  # Remembered
+    char = character_manager.create_character("GraphTest", "Mage")
+    assert quest_handler.attach_quest_tracker(char, quests, graph).graph is graph
+    assert quest_handler.validate_quest_graph(quests, graph) == quest_handler.validate_quest_graph(quests)
+    assert sorted(graph.children['first_steps']) == ['equipment_upgrade', 'goblin_hunter']
+    for qid in quests:
+        prereq = graph.parent[qid]
+        if prereq is not None:
+            assert graph.order.index(prereq) < graph.order.index(qid)
+    assert quest_handler.validate_quest_prerequisites(quests) == True
+    
+    # A deep chain is built without walking it again for each quest
+    deep = {'q0': {'prerequisite': 'NONE'}}
+    for i in range(1, 5000):
+        deep['q' + str(i)] = {'prerequisite': 'q' + str(i - 1)}
+    assert len(quest_handler.get_quest_prerequisite_chain('q4999', deep)) == 5000
+    deep_graph = quest_handler.QuestGraph(deep)
+    assert quest_handler.get_quest_prerequisite_chain('q4999', deep, deep_graph)[-2:] == ['q4998', 'q4999']
+    assert len(deep_graph._chains) <= quest_handler.CHAIN_CACHE_SIZE
+
+def test_quest_chains_follow_edits_to_quest_data():
+    """Test that chains and validation see quests edited in place"""
+    qs = {'a': {'prerequisite': 'NONE'}, 'b': {'prerequisite': 'a'}, 'c': {'prerequisite': 'NONE'}}
+    graph = quest_handler.QuestGraph(qs)
+    assert quest_handler.get_quest_prerequisite_chain('b', qs) == ['a', 'b']
+    
+    qs['b']['prerequisite'] = 'c'
+    assert quest_handler.get_quest_prerequisite_chain('b', qs) == ['c', 'b']
+    del qs['a']
+    qs['d'] = {'prerequisite': 'NONE'}
+    qs['b']['prerequisite'] = 'a'  # Now dangling
+    with pytest.raises(quest_handler.QuestNotFoundError):
+        quest_handler.get_quest_prerequisite_chain('b', qs)
+    with pytest.raises(quest_handler.QuestNotFoundError):
+        quest_handler.validate_quest_prerequisites(qs)
+    assert quest_handler.validate_quest_graph(qs)['dangling'] == [('b', 'a')]
+    
+    # A graph is a snapshot; a new one sees the edits
+    assert graph.parent['b'] == 'a' and 'd' not in graph.parent
+    assert quest_handler.QuestGraph(qs).missing == [('b', 'a')]
+
+def test_quest_graph_validation_report():
+    """Test that graph validation finds every kind of problem in one pass"""
+    quests = {
+        'root': {'prerequisite': 'NONE', 'required_level': 5},
+        'low': {'prerequisite': 'root', 'required_level': 2},
+        'loop_a': {'prerequisite': 'loop_b', 'required_level': 1},
+        'loop_b': {'prerequisite': 'loop_a', 'required_level': 1},
+        'after_loop': {'prerequisite': 'loop_a', 'required_level': 1},
+        'orphan': {'prerequisite': 'ghost', 'required_level': 1}
+    }
+    report = quest_handler.validate_quest_graph(quests)
+    
+    assert report['dangling'] == [('orphan', 'ghost')]
+    assert [sorted(cycle) for cycle in report['cycles']] == [['loop_a', 'loop_b']]
+    assert sorted(report['unreachable']) == ['after_loop', 'loop_a', 'loop_b', 'orphan']
+    assert report['level_conflicts'] == [('low', 'root', 2, 5)]
+    assert len(quest_handler.format_quest_graph_problems(report)) == 7
+    
+    clean = quest_handler.validate_quest_graph(game_data.load_quests("data/quests.txt"))
+    assert clean == {'dangling': [], 'cycles': [], 'unreachable': [], 'level_conflicts': []}
+
+def test_plan_route_respects_prerequisites_and_levels():
+    """Test that route plans are valid orders that reach the goal"""
+    quests = game_data.load_quests("data/quests.txt")
+    veteran = character_manager.create_character("PlannerTest", "Warrior")
+    veteran['level'] = 10
+    
+    plan = quest_handler.plan_route(veteran, quests, {'gold': None})
+    assert sorted(plan['quests']) == sorted(quests)
+    assert plan['gold'] == sum(q['reward_gold'] for q in quests.values())
+    for qid in plan['quests']:
+        prereq = quests[qid]['prerequisite']
+        if prereq != 'NONE':
+            assert plan['quests'].index(prereq) < plan['quests'].index(qid)
+    
+    # A level goal follows the XP curve and prefers the richer chain
+    chain = {
+        'a': {'reward_xp': 100, 'reward_gold': 0, 'required_level': 1, 'prerequisite': 'NONE'},
+        'b': {'reward_xp': 10, 'reward_gold': 0, 'required_level': 1, 'prerequisite': 'NONE'},
+        'c': {'reward_xp': 500, 'reward_gold': 0, 'required_level': 2, 'prerequisite': 'b'}
+    }
+    newbie = character_manager.create_character("PlannerNewbie", "Mage")
+    plan = quest_handler.plan_route(newbie, chain, {'level': 3})
+    assert plan['quests'] == ['b', 'a', 'c']
+    assert plan['goal_met'] and plan['final_level'] >= 3
+    assert newbie['level'] == 1  # The real character is untouched
+
+def test_objective_tracking_counts_matching_events(tmp_path):
+    """Test that kills and purchases advance only the quests that care about them"""
+    quests = game_data.load_quests("data/quests.txt")
+    assert quests['goblin_hunter']['objectives'] == (('kill', ('goblin',), 3),)
+    assert quests['master_adventurer']['objectives'] == ()
+    
+    char = character_manager.create_character("ObjectiveTest", "Warrior")
+    char['level'] = 5
+    quest_handler.attach_objective_tracker(char, quests)
+    quest_handler.accept_quest(char, 'first_steps', quests)
+    assert quest_handler.record_quest_event(char, 'kill', 'orc') == ['first_steps']
+    quest_handler.complete_quest(char, 'first_steps', quests)
+    
+    # Only quests watching "kill:goblin" (or "kill:any") move
+    quest_handler.accept_quest(char, 'goblin_hunter', quests)
+    quest_handler.accept_quest(char, 'equipment_upgrade', quests)
+    assert quest_handler.record_quest_event(char, 'kill', 'goblin') == []
+    assert quest_handler.record_quest_event(char, 'kill', 'orc') == []
+    assert char['quest_progress'] == {'goblin_hunter': [1], 'equipment_upgrade': [0]}
+    
+    # An item that matches twice (ID and type) only counts once
+    assert quest_handler.record_quest_event(char, 'buy', ['iron_sword', 'weapon']) == ['equipment_upgrade']
+    assert quest_handler.get_objective_progress(char, 'goblin_hunter', quests) == [('kill', ('goblin',), 1, 3)]
+    
+    # Progress is saved and picked back up by a new tracker
+    character_manager.save_character(char, str(tmp_path))
+    loaded = character_manager.load_character("ObjectiveTest", str(tmp_path))
+    assert loaded['quest_progress']['goblin_hunter'] == [1]
+    quest_handler.attach_objective_tracker(loaded, quests)
+    assert quest_handler.record_quest_event(loaded, 'kill', 'goblin', 2) == ['goblin_hunter']
+    
+    # Finished or dropped quests stop listening
+    quest_handler.complete_quest(loaded, 'goblin_hunter', quests)
+    quest_handler.accept_quest(loaded, 'orc_menace', quests)
+    quest_handler.record_quest_event(loaded, 'kill', 'orc')
+    quest_handler.abandon_quest(loaded, 'orc_menace')
+    assert list(loaded['quest_progress']) == ['equipment_upgrade']
+    assert quest_handler.record_quest_event(loaded, 'kill', 'goblin') == []
+
+def test_quest_event_bus_delivers_sync_and_async():
+    """Test that quest actions reach sync and background subscribers"""
+    import threading
+    quests = game_data.load_quests("data/quests.txt")
+    char = character_manager.create_character("EventTest", "Rogue")
+    char['level'] = 2
+    bus = quest_handler.quest_events
+    
+    seen = []
+    batches = []
+    completed = bus.subscribe(seen.append, kinds=[quest_handler.QUEST_COMPLETED])
+    background = bus.subscribe(batches.append, mode="async", batch_size=10, batch_wait=0.05)
+    try:
+        quest_handler.accept_quest(char, 'first_steps', quests)
+        quest_handler.complete_quest(char, 'first_steps', quests)
+        quest_handler.accept_quest(char, 'goblin_hunter', quests)
+        quest_handler.abandon_quest(char, 'goblin_hunter')
+        
+        assert [(e.kind, e.quest_id, e.rewards) for e in seen] == [
+            ('quest_completed', 'first_steps', {'xp': 50, 'gold': 25})]
+        bus.flush()
+        events = [e for batch in batches for e in batch]
+        assert [e.kind for e in events] == ['quest_accepted', 'quest_completed',
+                                            'quest_accepted', 'quest_abandoned']
+        assert events[0].character is char
+    finally:
+        bus.unsubscribe(completed)
+        bus.unsubscribe(background)
+    
+    # A stuck subscriber sheds events instead of holding up the quest action
+    gate = threading.Event()
+    stuck = bus.subscribe(lambda batch: gate.wait(), mode="async", max_queue=2, overflow="drop_newest")
+    try:
+        for _ in range(3):
+            quest_handler.accept_quest(char, 'goblin_hunter', quests)
+            quest_handler.abandon_quest(char, 'goblin_hunter')
+        assert stuck.dropped >= 3
+    finally:
+        gate.set()
+        bus.unsubscribe(stuck)
+    assert stuck.error_count == 0
+    assert bus.subscriptions == ()
+    
+    # Closing a blocked subscriber with a full queue gives up instead of hanging
+    gate = threading.Event()
+    blocked = bus.subscribe(lambda batch: gate.wait(), mode="async", max_queue=1, overflow="block")
+    bus.emit(quest_handler.QUEST_ACCEPTED, char, 'a')
+    while not blocked.queue.empty():
+        pass  # Wait for the thread to take the first event
+    bus.emit(quest_handler.QUEST_ACCEPTED, char, 'b')  # Fills the queue
+    assert bus.unsubscribe(blocked, timeout=0.05) == False
+    gate.set()
+    blocked.thread.join(5)
+    assert not blocked.thread.is_alive()
+    
+    # Failing subscribers keep a count and only the latest errors
+    failing = bus.subscribe(lambda event: 1 / 0)
+    try:
+        for _ in range(quest_handler.ERROR_HISTORY + 5):
+            bus.emit(quest_handler.QUEST_ABANDONED, char, 'a')
+    finally:
+        bus.unsubscribe(failing)
+    assert failing.error_count == quest_handler.ERROR_HISTORY + 5
+    assert len(failing.errors) == quest_handler.ERROR_HISTORY
+
+def test_quest_board_renders_in_one_write():
+    """Test that quest tables fit the width, page, and reuse cached rows"""
+    class CountingStream:
+        def __init__(self):
+            self.writes = []
+        def write(self, text):
+            self.writes.append(text)
+    
+    quests = {}
+    for i in range(45):
+        quests['q' + str(i)] = {'quest_id': 'q' + str(i), 'title': 'A very long quest title ' * 3,
+                                'required_level': i % 5 + 1, 'reward_xp': i, 'reward_gold': 2 * i}
+    stream = CountingStream()
+    quest_handler.display_quest_list(list(quests.values()), page=3, width=60, stream=stream)
+    
+    assert len(stream.writes) == 1
+    lines = stream.writes[0].splitlines()
+    assert lines[-1] == "Page 3 of 3"
+    assert len(lines) == 2 + 5 + 1  # Header, rule, 5 quests, footer
+    assert all(len(line) == 60 for line in lines[:-1])
+    assert lines[2].startswith("q40") and "..." in lines[2]
+    
+    # Unchanged quests reuse their row, changed ones are redrawn
+    row = quest_handler.format_quest_row(quests['q40'], 3, 34)
+    assert quest_handler.format_quest_row(quests['q40'], 3, 34) is row
+    quests['q40']['reward_gold'] = 999
+    assert "999" in quest_handler.format_quest_row(quests['q40'], 3, 34)
+    
+    # The first board at a new layout skips the cache, a redraw fills it
+    quest_handler._row_cache.clear()
+    board = [quests['q1'], quests['q2']]
+    first = quest_handler.format_quest_table(board, width=71)
+    assert quest_handler._row_cache == {}
+    assert quest_handler.format_quest_table(board, width=71) == first
+    assert len(quest_handler._row_cache) == 2
+    
+    char = character_manager.create_character("BoardTest", "Mage")
+    quest_handler.display_active_quests(char, quests, stream=stream)
+    assert stream.writes[-1].endswith("No quests.\n")
+
+def test_quest_table_queries_match_dict_queries():
+    """Test that columnar quest queries give the same answers as dict scans"""
+    quests = game_data.load_quests("data/quests.txt")
+    table = game_data.QuestTable(quests)
+    char = {'completed_quests': ['first_steps', 'goblin_hunter', 'not_a_quest']}
+    
+    for low, high in [(1, 1), (2, 3), (1, 10), (4, 5), (11, 20)]:
+        assert (quest_handler.get_quests_by_level(quests, low, high, table) ==
+                quest_handler.get_quests_by_level(quests, low, high))
+        expected = sum(q['reward_xp'] for q in quest_handler.get_quests_by_level(quests, low, high))
+        assert table.rewards_by_level(low, high)['total_xp'] == expected
+    
+    assert table.quest_ids_unlocked_at_level(2) == ['goblin_hunter', 'equipment_upgrade']
+    assert (quest_handler.calculate_quest_rewards(char, quests, table) ==
+            quest_handler.calculate_quest_rewards(char, quests) ==
+            {'total_xp': 150, 'total_gold': 100})
+
 # ============================================================================
 # COMBAT INTEGRATION TESTS
 # ============================================================================
@@ -249,6 +875,25 @@ def test_load_game_data():
         assert 'type' in item
         assert 'cost' in item
 
+def test_slotted_records_act_like_dicts():
+    """Test that Quest/Item records support dictionary-style access"""
+    import pickle
+    quests = game_data.load_quests("data/quests.txt")
+    quest = quests['goblin_hunter']
+    
+    assert isinstance(quest, game_data.Quest)
+    assert not hasattr(quest, '__dict__')
+    assert quest['reward_xp'] == quest.reward_xp
+    assert quest.get('missing', 'default') == 'default'
+    assert 'prerequisite' in quest and 'missing' not in quest
+    assert dict(quest)['quest_id'] == 'goblin_hunter'
+    assert game_data.Quest.from_dict(dict(quest)) == quest
+    assert game_data.Quest.from_dict({'quest_id': 'x'})['objectives'] == ()
+    assert pickle.loads(pickle.dumps(quest)) == quest
+    
+    with pytest.raises(KeyError):
+        quest['missing']
+
 def test_data_validation():
     """Test that data validation works"""
     valid_quest = {
@@ -274,6 +919,169 @@ def test_data_validation():
     
     assert game_data.validate_item_data(valid_item) == True
 
+def test_iter_quests_streams_records():
+    """Test that quests can be read one at a time and stopped early"""
+    quests = game_data.iter_quests("data/quests.txt")
+    first = next(quests)
+    
+    assert first['quest_id'] == 'first_steps'
+    quests.close()
+    
+    loaded = game_data.load_quests("data/quests.txt")
+    streamed = [item['item_id'] for item in game_data.iter_items("data/items.txt")]
+    assert len(loaded) > 1
+    assert streamed == list(game_data.load_items("data/items.txt"))
+
+def test_catalog_cache_rebuilds_when_file_changes(tmp_path, monkeypatch):
+    """Test that the compiled cache is reused and refreshed after edits"""
+    quest_file = tmp_path / "quests.txt"
+    block = ("QUEST_ID: {0}\nTITLE: T\nDESCRIPTION: D\nREWARD_XP: 10\n"
+             "REWARD_GOLD: 5\nREQUIRED_LEVEL: 1\nPREREQUISITE: NONE\n\n")
+    quest_file.write_text(block.format("a"))
+    
+    first = game_data.load_quests(str(quest_file), use_cache=True)
+    assert list(first) == ['a']
+    assert os.path.exists(game_data.get_cache_filename(str(quest_file)))
+    assert game_data.read_catalog_cache(str(quest_file)) == first
+    
+    # Editing the file must invalidate the cache
+    quest_file.write_text(block.format("a") + block.format("b"))
+    assert game_data.read_catalog_cache(str(quest_file)) is None
+    second = game_data.load_quests(str(quest_file), use_cache=True)
+    assert list(second) == ['a', 'b']
+    
+    # Touching the file keeps the cache and stores the new time, so the
+    # next load does not hash the file again
+    info = os.stat(quest_file)
+    os.utime(quest_file, ns=(info.st_atime_ns, info.st_mtime_ns + 10**9))
+    assert game_data.read_catalog_cache(str(quest_file)) == second
+    monkeypatch.setattr(game_data, "hash_file", None)  # Any call would fail
+    assert game_data.read_catalog_cache(str(quest_file)) == second
+
+def test_catalog_cache_hit_is_cheaper_than_parsing(tmp_path, monkeypatch):
+    """Test that a cache hit rebuilds records without parsing and beats a parse"""
+    quest_file = tmp_path / "quests.txt"
+    quest_file.write_text("".join(
+        "QUEST_ID: q{0}\nTITLE: Quest {0}\nDESCRIPTION: D\nREWARD_XP: {0}\n"
+        "REWARD_GOLD: 5\nREQUIRED_LEVEL: 1\nPREREQUISITE: NONE\n\n".format(i) for i in range(20000)))
+    
+    start = time.perf_counter()
+    parsed = game_data.load_quests(str(quest_file), use_cache=True)  # Miss, writes the cache
+    parse_seconds = time.perf_counter() - start
+    
+    # Records pickle as their constructor call, not as a dict of slots
+    assert parsed['q7'].__reduce__() == (game_data.Quest, tuple(parsed['q7'][k] for k in parsed['q7']))
+    
+    monkeypatch.setattr(game_data, "parse_block", None)  # Any parse would fail
+    start = time.perf_counter()
+    cached = game_data.load_quests(str(quest_file), use_cache=True)
+    hit_seconds = time.perf_counter() - start
+    assert cached == parsed and isinstance(cached['q7'], game_data.Quest)
+    assert hit_seconds < parse_seconds
+
+def test_lazy_item_catalog_matches_loaded_items():
+    """Test that the lazy catalog behaves like the loaded items dictionary"""
+    items = game_data.load_items("data/items.txt")
+    
+    with game_data.LazyItemCatalog("data/items.txt", cache_size=2) as lazy:
+        assert len(lazy) == len(items)
+        assert list(lazy) == list(items)
+        assert 'iron_sword' in lazy
+        assert 'missing_item' not in lazy
+        assert lazy.get('missing_item') is None
+        assert lazy['iron_sword'] == items['iron_sword']
+        assert dict(lazy) == items
+        
+        # Only the most recently used items stay parsed
+        assert len(lazy._cache) == 2
+
+def test_parallel_catalog_loading(tmp_path):
+    """Test that sharded parallel loading matches a normal load"""
+    quests = game_data.load_catalog_parallel("data/quests.txt", "quests",
+                                             workers=3, min_parallel_size=0)
+    items = game_data.load_catalog_parallel("data/items.txt", "items", workers=2)
+    
+    assert quests == game_data.load_quests("data/quests.txt")
+    assert list(quests) == list(game_data.load_quests("data/quests.txt"))
+    assert items == game_data.load_items("data/items.txt")
+    parallel_items = game_data.load_catalog_parallel("data/items.txt", "items",
+                                                     workers=2, min_parallel_size=0)
+    assert parallel_items == items and all(isinstance(i, game_data.Item) for i in parallel_items.values())
+    
+    # An ID repeated in another shard is still caught
+    quest_file = tmp_path / "quests.txt"
+    quest_file.write_text(Path("data/quests.txt").read_text() * 2)
+    with pytest.raises(game_data.InvalidDataFormatError):
+        game_data.load_catalog_parallel(str(quest_file), "quests", workers=2, min_parallel_size=0)
+    
+    # Shard ranges must cover the whole file without overlapping
+    ranges = game_data.find_shard_ranges("data/quests.txt", 4)
+    assert ranges[0][0] == 0
+    assert ranges[-1][1] == os.path.getsize("data/quests.txt")
+    for (start, end), (next_start, next_end) in zip(ranges, ranges[1:]):
+        assert end == next_start
+
+def test_catalog_watcher_reparses_only_changed_blocks(tmp_path):
+    """Test that live reloads swap in a new catalog with only edits re-parsed"""
+    item_file = tmp_path / "items.txt"
+    block = ("ITEM_ID: {0}\nNAME: {0}\nTYPE: consumable\n"
+             "EFFECT: health:5\nCOST: {1}\nDESCRIPTION: Heals\n\n")
+    item_file.write_text(block.format("a", 5) + block.format("b", 5) + block.format("c", 5))
+    
+    watcher = game_data.CatalogWatcher(str(item_file), "items")
+    old_catalog = watcher.catalog
+    assert watcher.check_for_changes() is None
+    
+    item_file.write_text(block.format("a", 5) + block.format("b", 9) + block.format("d", 5))
+    changes = watcher.reload()
+    
+    assert changes == {'added': ['d'], 'changed': ['b'], 'removed': ['c']}
+    assert watcher.catalog['a'] is old_catalog['a']  # Not parsed again
+    assert watcher.catalog['b']['cost'] == 9
+    assert old_catalog['b']['cost'] == 5  # Old snapshot is untouched
+    
+    # Removing a blank line joins two blocks, just like a full load reads it
+    item_file.write_text(block.format("a", 5) + block.format("b", 9).rstrip("\n") +
+                         "\n" + block.format("d", 5))
+    watcher.reload()
+    assert watcher.catalog == game_data.load_items(str(item_file))
+    
+    # A repeated ID is rejected and the old catalog stays in place
+    item_file.write_text(block.format("a", 5) + block.format("b", 9) + block.format("d", 5))
+    watcher.reload()
+    edited = watcher.catalog
+    item_file.write_text(block.format("a", 5) + block.format("b", 9) + block.format("a", 6))
+    with pytest.raises(game_data.InvalidDataFormatError):
+        watcher.reload()
+    assert watcher.catalog is edited
+    item_file.write_text(block.format("a", 5) + block.format("b", 9) + block.format("e", 6))
+    assert watcher.reload() == {'added': ['e'], 'changed': [], 'removed': ['d']}
+    assert list(watcher.catalog) == ['a', 'b', 'e']
+    assert watcher.catalog['a'] is old_catalog['a']
+
+def test_validate_catalog_file_reports_every_problem(tmp_path):
+    """Test that bulk validation collects all problems with line numbers"""
+    item_file = tmp_path / "items.txt"
+    item_file.write_text(
+        "ITEM_ID: good\nNAME: Good\nTYPE: consumable\nEFFECT: health:5\nCOST: 5\nDESCRIPTION: Ok\n\n"
+        "ITEM_ID: bad\nNAME: Bad\nTYPE: hat\nEFFECT: health\nCOST: lots\nCOLOR: red\n\n"
+        "ITEM_ID: good\nNAME: Again\nTYPE: armor\nEFFECT: magic:1\nCOST: 1\nDESCRIPTION: Dup\n"
+    )
+    
+    assert game_data.validate_catalog_file("data/items.txt", "items") == []
+    assert game_data.validate_catalog_file("data/quests.txt", "quests") == []
+    
+    problems = game_data.validate_catalog_file(str(item_file), "items")
+    found = [(p['line'], p['block_id']) for p in problems]
+    
+    assert (10, 'bad') in found    # Invalid TYPE
+    assert (11, 'bad') in found    # Unparseable EFFECT
+    assert (12, 'bad') in found    # COST is not a number
+    assert (13, 'bad') in found    # Unknown field
+    assert (8, 'bad') in found     # Missing DESCRIPTION
+    assert (15, 'good') in found   # Duplicate ID
+    assert len(problems) == 6
+
 # ============================================================================
 # FULL GAME WORKFLOW TEST
 # ============================================================================